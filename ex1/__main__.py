@@ -0,0 +1,227 @@
+"""
+Command-line entry point for the ex1 analyses.
+
+    python -m ex1 books      [INPUT] [-o OUTPUT] [--report FILE] [--mode serial|parallel]
+    python -m ex1 mechanics  [INPUT] [-o OUTPUT] [--mode serial|streaming|parallel]
+    python -m ex1 beam       [INPUT] [-o OUTPUT] [--mode serial|streaming|parallel]
+
+--mode streaming writes rows as they are computed: CSV for mechanics and JSON
+Lines for beam.
+
+INPUT and OUTPUT may be '-' for stdin/stdout; both default to files next to
+this module, like the scripts themselves. Only argparse is imported up
+front; each subcommand imports its own engine when it runs, so small jobs do
+not pay for the modules of the other analyses.
+"""
+import argparse
+import contextlib
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+STDIO = "-"
+
+
+def _source(path):
+    """File name for the engine loaders; fd 0 stands in for stdin."""
+    return 0 if path == STDIO else path
+
+
+def _results_format(args):
+    if args.format:
+        return args.format
+    if args.output == STDIO:
+        return "csv"
+    from results_io import infer_format
+    return infer_format(args.output)
+
+
+def _write(args, results, schema):
+    from results_io import write_results
+
+    fmt = _results_format(args)
+    if args.output == STDIO:
+        write_results(args.stdout.buffer if fmt == "columnar" else args.stdout, results, schema, fmt)
+        args.stdout.flush()
+    else:
+        try:
+            write_results(args.output, results, schema, fmt, append=args.append)
+        except ValueError as e:
+            sys.exit(f"error: {e}")
+        print(f"Results written to {args.output}", file=sys.stderr)
+
+
+def _require_files(args, mode):
+    if args.input == STDIO or args.output == STDIO:
+        sys.exit(f"error: --mode {mode} needs file paths, not stdin/stdout")
+
+
+def _require_format(args, mode, fmt):
+    if args.format not in (None, fmt):
+        sys.exit(f"error: --mode {mode} writes {fmt} rows as they are computed; --format {args.format} "
+                 f"is not supported")
+
+
+def run_books(args):
+    if args.mode == "parallel":
+        _require_files(args, "parallel")
+        from pipeline import book_pipeline
+        pipeline = book_pipeline(args.input, args.report or os.devnull, args.output, args.discount,
+                                 args.start_year, args.end_year, results_format=args.format,
+                                 append=args.append)
+        pipeline.run("thread", args.workers, targets=["write_results"] + (["report"] if args.report else []))
+        return
+
+    import ex1_I_IshShalom as engine
+
+    books = engine.load_book_data(_source(args.input))
+    books = engine.calculate_discount_price(books, args.discount)
+    if args.report:
+        engine.generate_book_report(books, args.report)
+    _write(args, {
+        "most_prolific_author": engine.find_most_prolific_author(books),
+        "unique_genres": sorted(engine.find_unique_genres(books)),
+        "average_price_by_genre": sorted(engine.calculate_average_price_by_genre(books).items()),
+        "recent_books": engine.filter_books_by_year(books, args.start_year, args.end_year),
+        "books_by_price": engine.sort_books(books, "price", reverse=True),
+    }, engine.BOOK_RESULTS)
+
+
+def run_mechanics(args):
+    if args.mode == "parallel":
+        _require_files(args, "parallel")
+        from pipeline import mechanics_pipeline
+        mechanics_pipeline(args.input, args.output, args.time_step, results_format=args.format,
+                           append=args.append).run("thread", args.workers)
+        return
+
+    if args.mode == "streaming":
+        _require_format(args, "streaming", "csv")
+        import csv
+        from live_sensor import RESULT_COLUMNS, KinematicsState, parse_sample
+
+        state = KinematicsState(args.time_step)
+        source = sys.stdin if args.input == STDIO else open(args.input, mode='r')
+        sink = args.stdout if args.output == STDIO else open(args.output, mode='a' if args.append else 'w',
+                                                           newline='')
+        try:
+            writer = csv.writer(sink)
+            if not args.append:
+                writer.writerow(RESULT_COLUMNS)
+            for line in source:
+                sample = parse_sample(line)
+                if sample is None:
+                    continue
+                try:
+                    update = state.update(sample)
+                except ValueError as e:
+                    print(f"Skipped sample {sample}: {e}", file=sys.stderr)
+                    continue
+                writer.writerow([update[column] for column in RESULT_COLUMNS])
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if sink is not args.stdout:
+                sink.close()
+        return
+
+    import ex1_II_IshShalom as engine
+
+    data = engine.read_mechanical_data(_source(args.input))
+    position_data = [(t, x) for t, x, f in data]
+    force_data = [(t, f) for t, x, f in data]
+    velocity_data = engine.calculate_velocity(position_data, args.time_step)
+    _write(args, {
+        "velocity": velocity_data,
+        "acceleration": engine.calculate_acceleration(velocity_data, args.time_step),
+        "max_force": engine.find_max_force(force_data),
+        "work_done": engine.calculate_work_done(force_data, position_data),
+    }, engine.MECHANICS_RESULTS)
+
+
+def run_beam(args):
+    from beam_data import BEAM_BATCH_RESULTS, BeamDataError, batch_rows, evaluate_beams, iter_beams
+
+    if args.mode == "streaming":
+        _require_format(args, "streaming", "json")
+    source = sys.stdin if args.input == STDIO else args.input
+    try:
+        evaluated = evaluate_beams(iter_beams(source, args.input_format),
+                                   workers=args.workers if args.mode == "parallel" else None)
+        if args.mode == "streaming":
+            import json
+            sink = args.stdout if args.output == STDIO else open(args.output, mode='a' if args.append else 'w')
+            try:
+                for beam_id, results in evaluated:
+                    sink.write(json.dumps({"id": beam_id, **results}) + "\n")
+            finally:
+                if sink is not args.stdout:
+                    sink.close()
+            return
+        _write(args, {"beams": list(batch_rows(evaluated))}, BEAM_BATCH_RESULTS)
+    except BeamDataError as e:
+        sys.exit(f"error: {e}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m ex1", description="ME371 exercise 1 analyses.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(command, default_input, default_output, modes):
+        command.add_argument("input", nargs="?", default=os.path.join(HERE, default_input),
+                             help=f"input file or '-' for stdin (default: {default_input})")
+        command.add_argument("-o", "--output", default=os.path.join(HERE, default_output),
+                             help=f"results file or '-' for stdout (default: {default_output})")
+        command.add_argument("--format", choices=("csv", "json", "columnar"),
+                             help="results format; inferred from the output extension by default")
+        command.add_argument("--append", action="store_true", help="append to an existing results file")
+        command.add_argument("--mode", choices=modes, default="serial")
+        command.add_argument("--workers", type=int, default=None, help="pool size for --mode parallel")
+
+    books = commands.add_parser("books", help="book data analysis (ex1_I)")
+    add_common(books, "books.csv", "book_analysis_results.csv", ("serial", "parallel"))
+    books.add_argument("--report", help="also write the text report to this file")
+    books.add_argument("--discount", type=float, default=0.1)
+    books.add_argument("--start-year", type=int, default=2000)
+    books.add_argument("--end-year", type=int, default=2023)
+    books.set_defaults(run=run_books)
+
+    mechanics = commands.add_parser("mechanics", help="mechanical data analysis (ex1_II)")
+    add_common(mechanics, "mechanical_data.csv", "analysis_results.csv", ("serial", "streaming", "parallel"))
+    mechanics.add_argument("--time-step", type=float, default=0.1)
+    mechanics.set_defaults(run=run_mechanics)
+
+    beam = commands.add_parser("beam", help="beam analysis (ex1_III), one or many beams per file")
+    # Not beam_analysis_results.csv: the batch layout differs from the ex1_III script's.
+    add_common(beam, "beam_data.csv", "beam_batch_results.csv", ("serial", "streaming", "parallel"))
+    beam.add_argument("--input-format", choices=("csv", "jsonl"),
+                      help="beam file format; inferred from the extension or content by default")
+    beam.set_defaults(run=run_beam)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.mode == "parallel" and args.workers is None and args.command == "beam":
+        args.workers = os.cpu_count() or 1
+    # Results go to args.stdout. With '-o -' anything the engines print, such as
+    # progress and skipped-row messages, is sent to stderr so it cannot corrupt them.
+    args.stdout = sys.stdout
+    try:
+        if args.output == STDIO:
+            with contextlib.redirect_stdout(sys.stderr):
+                args.run(args)
+        else:
+            args.run(args)
+    except BrokenPipeError:
+        # Output was piped into a command that stopped reading, e.g. head.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
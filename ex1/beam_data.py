@@ -0,0 +1,316 @@
+import csv
+import json
+import os
+from collections import namedtuple
+
+import instrumentation
+from beam_sections import rectangle, section_properties
+from ex1_III_IshShalom import _is_load_header, analyze_beam
+from instrumentation import instrument, instrument_iter
+from results_io import Field, ResultSchema
+
+Beam = namedtuple("Beam", ["beam_id", "length", "section", "elastic_modulus", "loads"])
+
+PROPERTY_FIELDS = ["length", "width", "height", "elastic_modulus"]
+JSON_SUFFIXES = (".jsonl", ".ndjson")
+
+BEAM_BATCH_RESULTS = ResultSchema("beam_batch", [
+    Field("beams", "Beam Results", "series",
+          ("Beam", "Max Bending Stress (Pa)", "Max Shear Stress (Pa)", "Max Deflection (m)")),
+])
+
+
+class BeamDataError(ValueError):
+    """Raised when a beam record cannot be parsed or fails validation."""
+
+    def __init__(self, message, source=None, line=None):
+        location = ""
+        if source is not None:
+            location = f"{source}:{line}: " if line is not None else f"{source}: "
+        super().__init__(location + message)
+        self.source = source
+        self.line = line
+
+
+def _number(value, name):
+    if isinstance(value, bool):
+        raise BeamDataError(f"{name} must be a number, got {value!r}.")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise BeamDataError(f"{name} must be a number, got {value!r}.") from None
+    if number != number or number in (float("inf"), float("-inf")):
+        raise BeamDataError(f"{name} must be finite, got {value!r}.")
+    return number
+
+
+def _positive(value, name):
+    number = _number(value, name)
+    if number <= 0:
+        raise BeamDataError(f"{name} must be positive, got {value!r}.")
+    return number
+
+
+def _check_load(index, load, length):
+    try:
+        position, magnitude = load
+    except (TypeError, ValueError):
+        raise BeamDataError(f"load {index} must be a (position, magnitude) pair, got {load!r}.") from None
+    position = _number(position, f"load {index} position")
+    magnitude = _number(magnitude, f"load {index} magnitude")
+    if not 0 <= position <= length:
+        raise BeamDataError(f"load {index} position {position} lies outside the beam (0 to {length}).")
+    return position, magnitude
+
+
+def make_beam(beam_id, length, section, elastic_modulus, loads):
+    """
+    Validate raw beam fields and build a Beam.
+
+    Args:
+    beam_id (str): Identifier of the beam
+    length (float): Length of the beam
+    section (Section): Cross-section properties of the beam
+    elastic_modulus (float): Elastic modulus of the beam material
+    loads (list): List of (position, magnitude) pairs
+
+    Returns:
+    Beam: Validated beam record
+    """
+    length = _positive(length, "length")
+    elastic_modulus = _positive(elastic_modulus, "elastic_modulus")
+    checked_loads = [_check_load(index, load, length) for index, load in enumerate(loads, start=1)]
+
+    return Beam(str(beam_id), length, section, elastic_modulus, checked_loads)
+
+
+def _iter_csv_beams(file, source):
+    """
+    Parse the CSV section format.
+
+    Beams are separated by blank lines. Each beam is an optional 'beam,<id>'
+    line, the 'length,width,height,elastic_modulus' header, one property row,
+    an optional 'position,magnitude' header and then one row per load. A plain
+    single-beam file such as beam_data.csv is a valid one-beam input.
+    """
+    block = []
+    count = 0
+    for line_number, row in enumerate(csv.reader(file), start=1):
+        row = [cell.strip() for cell in row]
+        if any(row):
+            block.append((line_number, row))
+            continue
+        if block:
+            count += 1
+            yield _csv_block_to_beam(block, source, count)
+            block = []
+    if block:
+        count += 1
+        yield _csv_block_to_beam(block, source, count)
+
+
+def _csv_block_to_beam(block, source, count):
+    rows = iter(block)
+    line_number, row = next(rows)
+    beam_id = str(count)
+    try:
+        if row[0].lower() == "beam":
+            if len(row) > 1 and row[1]:
+                beam_id = row[1]
+            line_number, row = next(rows)
+
+        if [cell.lower() for cell in row] != PROPERTY_FIELDS:
+            raise BeamDataError(f"expected header {','.join(PROPERTY_FIELDS)}, got {','.join(row)!r}.")
+        line_number, row = next(rows)
+        property_line = line_number
+        if len(row) != len(PROPERTY_FIELDS):
+            raise BeamDataError(f"expected {len(PROPERTY_FIELDS)} beam properties, got {len(row)}.")
+        length, width, height, elastic_modulus = row
+
+        loads = []
+        load_lines = []
+        for index, (line_number, row) in enumerate(rows):
+            if index == 0 and _is_load_header(row):
+                continue
+            if len(row) != 2:
+                raise BeamDataError(f"expected position,magnitude, got {','.join(row)!r}.")
+            loads.append(row)
+            load_lines.append(line_number)
+    except StopIteration:
+        raise BeamDataError(f"beam '{beam_id}' is incomplete.", source, line_number) from None
+    except BeamDataError as e:
+        raise BeamDataError(str(e), source, line_number) from None
+
+    try:
+        section = rectangle(_positive(width, "width"), _positive(height, "height"))
+        beam = make_beam(beam_id, length, section, elastic_modulus, [])
+    except BeamDataError as e:
+        raise BeamDataError(f"beam '{beam_id}': {e}", source, property_line) from None
+
+    checked_loads = []
+    for index, (load, line_number) in enumerate(zip(loads, load_lines), start=1):
+        try:
+            checked_loads.append(_check_load(index, load, beam.length))
+        except BeamDataError as e:
+            raise BeamDataError(f"beam '{beam_id}': {e}", source, line_number) from None
+    return beam._replace(loads=checked_loads)
+
+
+def _json_section(record):
+    if "section" in record:
+        spec = record["section"]
+        if not isinstance(spec, dict) or "kind" not in spec or "dims" not in spec:
+            raise BeamDataError("section must be an object with 'kind' and 'dims'.")
+        kind = spec["kind"]
+        if not isinstance(spec["dims"], list):
+            raise BeamDataError(f"section dims must be a list, got {spec['dims']!r}.")
+        if kind == "polygon":
+            for vertex in spec["dims"]:
+                if not isinstance(vertex, list) or len(vertex) != 2:
+                    raise BeamDataError(f"polygon vertices must be [x, y] pairs, got {vertex!r}.")
+            dims = tuple((_number(x, "vertex x"), _number(y, "vertex y")) for x, y in spec["dims"])
+        else:
+            dims = tuple(_positive(value, f"{kind} dimension") for value in spec["dims"])
+        try:
+            return section_properties(kind, dims)
+        except (TypeError, ValueError) as e:
+            raise BeamDataError(f"invalid {kind} section: {e}") from None
+    return rectangle(_positive(record.get("width"), "width"), _positive(record.get("height"), "height"))
+
+
+def _iter_json_beams(file, source):
+    """
+    Parse the JSON Lines format: one object per line with 'length',
+    'elastic_modulus', 'loads' ([[position, magnitude], ...]) and either
+    'width'/'height' or a 'section' object {'kind': ..., 'dims': [...]}.
+    An optional 'id' names the beam.
+    """
+    count = 0
+    for line_number, line in enumerate(file, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        count += 1
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise BeamDataError(f"invalid JSON: {e.msg}.", source, line_number) from None
+        if not isinstance(record, dict):
+            raise BeamDataError("each line must be a JSON object.", source, line_number)
+        beam_id = record.get("id", count)
+        try:
+            for field in ("length", "elastic_modulus", "loads"):
+                if field not in record:
+                    raise BeamDataError(f"missing field '{field}'.")
+            if not isinstance(record["loads"], list):
+                raise BeamDataError(f"loads must be a list of [position, magnitude] pairs, got {record['loads']!r}.")
+            section = _json_section(record)
+            yield make_beam(beam_id, record["length"], section, record["elastic_modulus"], record["loads"])
+        except BeamDataError as e:
+            raise BeamDataError(f"beam '{beam_id}': {e}", source, line_number) from None
+
+
+@instrument_iter()
+def iter_beams(source, fmt=None):
+    """
+    Stream beams one at a time from a multi-beam file.
+
+    Args:
+    source (str or file): Path of the input file, or an open text file
+    fmt (str): 'csv' or 'jsonl'; inferred from the file extension or the first
+        character of the data when omitted
+
+    Yields:
+    Beam: Validated beam records in file order
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if fmt is None:
+            fmt = "jsonl" if str(source).lower().endswith(JSON_SUFFIXES) else "csv"
+        with open(source, mode='r', newline='') as file:
+            yield from _iter_file_beams(file, fmt)
+        return
+    yield from _iter_file_beams(source, fmt)
+
+
+def _iter_file_beams(source, fmt):
+    name = getattr(source, "name", "<stream>")
+    if fmt is None:
+        first = source.readline()
+        fmt = "jsonl" if first.lstrip().startswith("{") else "csv"
+        source = _prepend(first, source)
+
+    if fmt == "jsonl":
+        yield from _iter_json_beams(source, name)
+    elif fmt == "csv":
+        yield from _iter_csv_beams(source, name)
+    else:
+        raise ValueError(f"Unknown beam data format '{fmt}'.")
+
+
+def batch_rows(evaluated):
+    """
+    Flatten evaluate_beams() output into rows of the BEAM_BATCH_RESULTS 'beams' field.
+
+    Args:
+    evaluated (iterable): (beam_id, results) pairs
+
+    Yields:
+    tuple: (beam_id, max_bending_stress, max_shear_stress, max_deflection)
+    """
+    for beam_id, results in evaluated:
+        yield (beam_id, results["max_bending_stress"], results["max_shear_stress"],
+               results["max_deflection"])
+
+
+def _prepend(line, file):
+    yield line
+    yield from file
+
+
+@instrument(rows=0)
+def _evaluate_chunk(chunk):
+    return [(beam.beam_id, analyze_beam(beam.length, beam.section, beam.elastic_modulus, beam.loads))
+            for beam in chunk]
+
+
+def _chunks(beams, chunk_size):
+    chunk = []
+    for beam in beams:
+        chunk.append(beam)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def evaluate_beams(beams, workers=None, chunk_size=256):
+    """
+    Analyze a stream of beams, optionally on a process pool.
+
+    Beams are pulled from the iterable lazily and at most two chunks per worker
+    are in flight, so memory stays bounded for arbitrarily large inputs.
+
+    Args:
+    beams (iterable of Beam): Beams to analyze, e.g. from iter_beams()
+    workers (int): Number of worker processes; None or 1 evaluates in this process
+    chunk_size (int): Beams per task sent to a worker
+
+    Yields:
+    tuple: (beam_id, results) in input order, results as returned by analyze_beam
+    """
+    if not workers or workers == 1:
+        for beam in beams:
+            yield beam.beam_id, analyze_beam(beam.length, beam.section, beam.elastic_modulus, beam.loads)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers, **instrumentation.worker_options()) as executor:
+        pending = []
+        for chunk in _chunks(beams, chunk_size):
+            pending.append(executor.submit(instrumentation.call_measured, _evaluate_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from instrumentation.collect(pending.pop(0))
+        for future in pending:
+            yield from instrumentation.collect(future)
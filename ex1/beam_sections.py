@@ -0,0 +1,344 @@
+import math
+from collections import namedtuple
+from functools import lru_cache
+
+Section = namedtuple(
+    "Section",
+    ["kind", "dims", "area", "moment_of_inertia", "y_max", "first_moment", "width"],
+)
+Section.__doc__ = """
+Geometric properties of a beam cross-section about its horizontal centroidal axis.
+
+Fields:
+kind (str): Profile name ('rectangle', 'i_beam', 'hollow_box', 'circle', 'tube', 'polygon')
+dims (tuple): Geometry tuple the properties were computed from
+area (float): Cross-sectional area
+moment_of_inertia (float): Second moment of area about the neutral axis
+y_max (float): Distance from neutral axis to extreme fiber
+first_moment (float): First moment of area above the neutral axis
+width (float): Width of the section at the neutral axis
+"""
+
+
+def _check_positive(**dims):
+    for name, value in dims.items():
+        if value <= 0:
+            raise ValueError(f"{name} must be positive, got {value}.")
+
+
+def _rectangle(width, height):
+    _check_positive(width=width, height=height)
+    area = width * height
+    moment_of_inertia = (width * height**3) / 12
+    first_moment = (width * height**2) / 8
+    return area, moment_of_inertia, height / 2, first_moment, width
+
+
+def _i_beam(flange_width, flange_thickness, web_thickness, height):
+    _check_positive(flange_width=flange_width, flange_thickness=flange_thickness,
+                    web_thickness=web_thickness, height=height)
+    if 2 * flange_thickness >= height:
+        raise ValueError("Flanges must be thinner than half the section height.")
+    if web_thickness > flange_width:
+        raise ValueError("Web cannot be wider than the flanges.")
+    web_height = height - 2 * flange_thickness
+    area = 2 * flange_width * flange_thickness + web_thickness * web_height
+    moment_of_inertia = (flange_width * height**3 - (flange_width - web_thickness) * web_height**3) / 12
+    first_moment = (flange_width * flange_thickness * (height - flange_thickness) / 2
+                    + web_thickness * web_height**2 / 8)
+    return area, moment_of_inertia, height / 2, first_moment, web_thickness
+
+
+def _hollow_box(width, height, wall_thickness):
+    _check_positive(width=width, height=height, wall_thickness=wall_thickness)
+    if 2 * wall_thickness >= min(width, height):
+        raise ValueError("Wall thickness must be less than half the smallest outer dimension.")
+    inner_width = width - 2 * wall_thickness
+    inner_height = height - 2 * wall_thickness
+    area = width * height - inner_width * inner_height
+    moment_of_inertia = (width * height**3 - inner_width * inner_height**3) / 12
+    first_moment = (width * height**2 - inner_width * inner_height**2) / 8
+    return area, moment_of_inertia, height / 2, first_moment, 2 * wall_thickness
+
+
+def _circle(diameter):
+    _check_positive(diameter=diameter)
+    area = math.pi * diameter**2 / 4
+    moment_of_inertia = math.pi * diameter**4 / 64
+    first_moment = diameter**3 / 12
+    return area, moment_of_inertia, diameter / 2, first_moment, diameter
+
+
+def _tube(outer_diameter, inner_diameter):
+    _check_positive(outer_diameter=outer_diameter, inner_diameter=inner_diameter)
+    if inner_diameter >= outer_diameter:
+        raise ValueError("Inner diameter must be smaller than outer diameter.")
+    area = math.pi * (outer_diameter**2 - inner_diameter**2) / 4
+    moment_of_inertia = math.pi * (outer_diameter**4 - inner_diameter**4) / 64
+    first_moment = (outer_diameter**3 - inner_diameter**3) / 12
+    return area, moment_of_inertia, outer_diameter / 2, first_moment, outer_diameter - inner_diameter
+
+
+def _shoelace(xs, ys):
+    """
+    Return (area, first moment about x-axis, second moment about x-axis) of a closed polygon.
+
+    All three sums are formed in one pass over the edge list (x_i, y_i) -> (x_i+1, y_i+1),
+    so the result is signed by the vertex orientation.
+    """
+    x_next = xs[1:] + xs[:1]
+    y_next = ys[1:] + ys[:1]
+    cross = [x0 * y1 - x1 * y0 for x0, y0, x1, y1 in zip(xs, ys, x_next, y_next)]
+    area = sum(cross) / 2
+    sy = sum(c * (y0 + y1) for c, y0, y1 in zip(cross, ys, y_next)) / 6
+    ixx = sum(c * (y0 * y0 + y0 * y1 + y1 * y1) for c, y0, y1 in zip(cross, ys, y_next)) / 12
+    return area, sy, ixx
+
+
+def _clip_above(xs, ys, level):
+    """
+    Clip a polygon to the half-plane y >= level.
+
+    Returns:
+    tuple: (xs, ys) of the clipped polygon, possibly empty
+    """
+    clipped_x, clipped_y = [], []
+    count = len(xs)
+    for i in range(count):
+        x0, y0 = xs[i - 1], ys[i - 1]
+        x1, y1 = xs[i], ys[i]
+        inside0 = y0 >= level
+        inside1 = y1 >= level
+        if inside0 != inside1:
+            t = (level - y0) / (y1 - y0)
+            clipped_x.append(x0 + t * (x1 - x0))
+            clipped_y.append(level)
+        if inside1:
+            clipped_x.append(x1)
+            clipped_y.append(y1)
+    return clipped_x, clipped_y
+
+
+def _chord_width(xs, ys, level):
+    """Total width of the material cut by the horizontal line y = level."""
+    crossings = []
+    count = len(xs)
+    for i in range(count):
+        x0, y0 = xs[i - 1], ys[i - 1]
+        x1, y1 = xs[i], ys[i]
+        if (y0 <= level < y1) or (y1 <= level < y0):
+            crossings.append(x0 + (level - y0) * (x1 - x0) / (y1 - y0))
+    crossings.sort()
+    return sum(right - left for left, right in zip(crossings[::2], crossings[1::2]))
+
+
+def _polygon(*vertices):
+    if len(vertices) < 3:
+        raise ValueError("A polygon section needs at least three vertices.")
+    xs = [float(x) for x, y in vertices]
+    ys = [float(y) for x, y in vertices]
+
+    area, sy, ixx = _shoelace(xs, ys)
+    if area == 0:
+        raise ValueError("Polygon section has zero area.")
+    if area < 0:
+        xs.reverse()
+        ys.reverse()
+        area, sy, ixx = -area, -sy, -ixx
+
+    centroid_y = sy / area
+    moment_of_inertia = ixx - area * centroid_y**2
+    y_max = max(abs(y - centroid_y) for y in ys)
+
+    upper_x, upper_y = _clip_above(xs, ys, centroid_y)
+    first_moment = 0.0
+    if len(upper_x) >= 3:
+        upper_area, upper_sy, _ = _shoelace(upper_x, upper_y)
+        first_moment = abs(upper_sy - upper_area * centroid_y)
+
+    width = _chord_width(xs, ys, centroid_y)
+    return area, moment_of_inertia, y_max, first_moment, width
+
+
+_PROFILES = {
+    "rectangle": _rectangle,
+    "i_beam": _i_beam,
+    "hollow_box": _hollow_box,
+    "circle": _circle,
+    "tube": _tube,
+    "polygon": _polygon,
+}
+
+# Dimension names of the fixed-arity profiles; a polygon takes any number of vertices.
+_DIMENSIONS = {
+    "rectangle": ("width", "height"),
+    "i_beam": ("flange_width", "flange_thickness", "web_thickness", "height"),
+    "hollow_box": ("width", "height", "wall_thickness"),
+    "circle": ("diameter",),
+    "tube": ("outer_diameter", "inner_diameter"),
+}
+
+
+def compute_section(kind, dims):
+    """
+    Compute the properties of a cross-section without consulting the cache.
+
+    Use this for one-off geometries, such as randomly sampled dimensions,
+    that would only evict useful entries from the cache.
+
+    Args:
+    kind (str): Profile name, one of the keys of the profile table
+    dims (tuple): Geometry tuple passed to the profile formula
+
+    Returns:
+    Section: Cross-section properties
+    """
+    try:
+        profile = _PROFILES[kind]
+    except KeyError:
+        raise ValueError(f"Unknown section kind '{kind}'.") from None
+    names = _DIMENSIONS.get(kind)
+    if names is not None and len(dims) != len(names):
+        raise ValueError(f"A {kind} section takes {len(names)} dimensions ({', '.join(names)}), "
+                         f"got {len(dims)}.")
+    return Section(kind, dims, *profile(*dims))
+
+
+@lru_cache(maxsize=4096)
+def section_properties(kind, dims):
+    """
+    Compute (and cache) the properties of a cross-section.
+
+    Args:
+    kind (str): Profile name, one of the keys of the profile table
+    dims (tuple): Geometry tuple passed to the profile formula
+
+    Returns:
+    Section: Cross-section properties
+    """
+    return compute_section(kind, dims)
+
+
+def rectangle(width, height):
+    """
+    Solid rectangular section.
+
+    Args:
+    width (float): Section width
+    height (float): Section height
+
+    Returns:
+    Section: Cross-section properties
+    """
+    return section_properties("rectangle", (float(width), float(height)))
+
+
+def i_beam(flange_width, flange_thickness, web_thickness, height):
+    """
+    Doubly symmetric I-beam section.
+
+    Args:
+    flange_width (float): Width of both flanges
+    flange_thickness (float): Thickness of each flange
+    web_thickness (float): Thickness of the web
+    height (float): Overall section height
+
+    Returns:
+    Section: Cross-section properties
+    """
+    dims = (float(flange_width), float(flange_thickness), float(web_thickness), float(height))
+    return section_properties("i_beam", dims)
+
+
+def hollow_box(width, height, wall_thickness):
+    """
+    Rectangular hollow section with a uniform wall.
+
+    Args:
+    width (float): Outer width
+    height (float): Outer height
+    wall_thickness (float): Wall thickness
+
+    Returns:
+    Section: Cross-section properties
+    """
+    return section_properties("hollow_box", (float(width), float(height), float(wall_thickness)))
+
+
+def circle(diameter):
+    """
+    Solid circular section.
+
+    Args:
+    diameter (float): Section diameter
+
+    Returns:
+    Section: Cross-section properties
+    """
+    return section_properties("circle", (float(diameter),))
+
+
+def tube(outer_diameter, inner_diameter):
+    """
+    Circular hollow section.
+
+    Args:
+    outer_diameter (float): Outer diameter
+    inner_diameter (float): Inner diameter
+
+    Returns:
+    Section: Cross-section properties
+    """
+    return section_properties("tube", (float(outer_diameter), float(inner_diameter)))
+
+
+def polygon(vertices):
+    """
+    Arbitrary simple polygon section, bending about its horizontal centroidal axis.
+
+    Args:
+    vertices (list): List of (x, y) tuples in either winding order
+
+    Returns:
+    Section: Cross-section properties
+    """
+    dims = tuple((float(x), float(y)) for x, y in vertices)
+    return section_properties("polygon", dims)
+
+
+_CONSTRUCTORS = {
+    "rectangle": rectangle,
+    "i_beam": i_beam,
+    "hollow_box": hollow_box,
+    "circle": circle,
+    "tube": tube,
+    "polygon": polygon,
+}
+
+
+def section_sweep(kind, dims_list):
+    """
+    Evaluate a batch of sections of one kind.
+
+    Geometries that have already been evaluated, in this sweep or earlier ones,
+    are served from the cache instead of being recomputed.
+
+    Args:
+    kind (str): Profile name
+    dims_list (list): List of geometry tuples
+
+    Returns:
+    list of Section: Cross-section properties in the order of dims_list
+    """
+    try:
+        make = _CONSTRUCTORS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown section kind '{kind}'.") from None
+    if kind == "polygon":
+        return [make(dims) for dims in dims_list]
+    return [make(*dims) for dims in dims_list]
+
+
+def clear_section_cache():
+    """Drop all cached section properties."""
+    section_properties.cache_clear()
@@ -0,0 +1,242 @@
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import ex1_I_IshShalom as books_engine
+import ex1_II_IshShalom as mechanics_engine
+import ex1_III_IshShalom as beam_engine
+from synthetic_data import generate_beam_data, generate_books, generate_mechanical_data
+
+BenchmarkCase = namedtuple("BenchmarkCase", ["name", "pipeline", "func", "arguments", "max_size"])
+BenchmarkCase.__new__.__defaults__ = (None,)
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_history.json")
+# Timings below this are dominated by scheduler and timer noise and are never compared.
+MIN_COMPARABLE_SECONDS = 1e-2
+# Each case is called until at least this much time has been measured.
+MIN_TOTAL_SECONDS = 0.2
+
+
+def _load_books(path):
+    books = books_engine.load_book_data(path)
+    books_engine.calculate_discount_price(books, 0.1)
+    return {"path": path, "books": books}
+
+
+def _load_mechanics(path):
+    data = mechanics_engine.read_mechanical_data(path)
+    position = [(t, x) for t, x, f in data]
+    force = [(t, f) for t, x, f in data]
+    velocity = mechanics_engine.calculate_velocity(position, 0.1)
+    return {"path": path, "position": position, "force": force, "velocity": velocity}
+
+
+def _load_beam(path):
+    length, width, height, elastic_modulus, loads = beam_engine.read_beam_data(path)
+    return {"path": path, "length": length, "elastic_modulus": elastic_modulus, "loads": loads,
+            "moment_of_inertia": (width * height**3) / 12}
+
+
+PIPELINES = {
+    "books": (generate_books, _load_books),
+    "mechanics": (generate_mechanical_data, _load_mechanics),
+    "beam": (generate_beam_data, _load_beam),
+}
+
+CASES = [
+    BenchmarkCase("books.load_book_data", "books", books_engine.load_book_data,
+                  lambda d: (d["path"],)),
+    BenchmarkCase("books.calculate_discount_price", "books", books_engine.calculate_discount_price,
+                  lambda d: (d["books"], 0.1)),
+    BenchmarkCase("books.find_unique_genres", "books", books_engine.find_unique_genres,
+                  lambda d: (d["books"],)),
+    BenchmarkCase("books.filter_books_by_year", "books", books_engine.filter_books_by_year,
+                  lambda d: (d["books"], 2000, 2023)),
+    BenchmarkCase("books.sort_books", "books", books_engine.sort_books,
+                  lambda d: (d["books"], "price", True)),
+    BenchmarkCase("books.find_most_prolific_author", "books", books_engine.find_most_prolific_author,
+                  lambda d: (d["books"],)),
+    BenchmarkCase("books.calculate_average_price_by_genre", "books",
+                  books_engine.calculate_average_price_by_genre, lambda d: (d["books"],)),
+    BenchmarkCase("mechanics.read_mechanical_data", "mechanics", mechanics_engine.read_mechanical_data,
+                  lambda d: (d["path"],)),
+    BenchmarkCase("mechanics.calculate_velocity", "mechanics", mechanics_engine.calculate_velocity,
+                  lambda d: (d["position"], 0.1)),
+    BenchmarkCase("mechanics.calculate_acceleration", "mechanics", mechanics_engine.calculate_acceleration,
+                  lambda d: (d["velocity"], 0.1)),
+    BenchmarkCase("mechanics.find_max_force", "mechanics", mechanics_engine.find_max_force,
+                  lambda d: (d["force"],)),
+    BenchmarkCase("mechanics.calculate_work_done", "mechanics", mechanics_engine.calculate_work_done,
+                  lambda d: (d["force"], d["position"])),
+    BenchmarkCase("beam.read_beam_data", "beam", beam_engine.read_beam_data,
+                  lambda d: (d["path"],)),
+    # Bending moment and shear are quadratic in the number of loads.
+    BenchmarkCase("beam.calculate_bending_moment", "beam", beam_engine.calculate_bending_moment,
+                  lambda d: (d["length"], d["loads"]), max_size=10000),
+    BenchmarkCase("beam.calculate_shear_force", "beam", beam_engine.calculate_shear_force,
+                  lambda d: (d["length"], d["loads"]), max_size=10000),
+    BenchmarkCase("beam.calculate_max_deflection", "beam", beam_engine.calculate_max_deflection,
+                  lambda d: (d["length"], d["loads"], d["elastic_modulus"], d["moment_of_inertia"])),
+]
+
+
+def time_call(func, args, repeat, min_total=MIN_TOTAL_SECONDS):
+    """
+    Median wall time of func(*args), and the peak traced allocation of one extra call.
+
+    Args:
+    func (callable): Function under test
+    args (tuple): Positional arguments
+    repeat (int): Minimum number of timed calls
+    min_total (float): Keep calling until this many seconds have been measured
+
+    Returns:
+    tuple: (seconds, peak_bytes)
+    """
+    timings = []
+    while len(timings) < repeat or sum(timings) < min_total:
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=3, pattern="*", workdir=None, seed=0):
+    """
+    Generate synthetic inputs and time every selected case at every size.
+
+    Args:
+    sizes (list): Rows (books, mechanics) or loads (beam) per input file
+    repeat (int): Minimum timed calls per case; the median is kept
+    pattern (str): Shell-style filter on case names
+    workdir (str): Directory for generated files; a temporary one when omitted
+    seed (int): Seed of the data generators
+
+    Returns:
+    dict: 'case|size' -> {'name', 'size', 'seconds', 'throughput', 'peak_bytes'}
+    """
+    cases = [case for case in CASES if fnmatch.fnmatch(case.name, pattern)]
+    results = {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for size in sizes:
+            for pipeline, (generate, load) in PIPELINES.items():
+                selected = [case for case in cases if case.pipeline == pipeline
+                            and (case.max_size is None or size <= case.max_size)]
+                if not selected:
+                    continue
+                path = os.path.join(tmp, f"{pipeline}_{size}.csv")
+                generate(path, size, seed=seed)
+                data = load(path)
+                for case in selected:
+                    seconds, peak = time_call(case.func, case.arguments(data), repeat)
+                    results[f"{case.name}|{size}"] = {
+                        "name": case.name,
+                        "size": size,
+                        "seconds": seconds,
+                        "throughput": size / seconds if seconds else float("inf"),
+                        "peak_bytes": peak,
+                    }
+                    print(f"{case.name:45s} {size:>10d} {seconds * 1e3:10.3f} ms {peak / 1e6:9.2f} MB")
+                os.remove(path)
+    return results
+
+
+def load_history(filename):
+    """Read the benchmark history file, or start an empty one."""
+    if not os.path.exists(filename):
+        return {"baseline": None, "runs": []}
+    with open(filename, mode='r') as file:
+        return json.load(file)
+
+
+def save_history(filename, history):
+    """Write the benchmark history file."""
+    with open(filename, mode='w') as file:
+        json.dump(history, file, indent=2)
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Compare a run against the baseline run.
+
+    Cases faster than MIN_COMPARABLE_SECONDS in either run are too noisy to
+    time reliably and are not compared.
+
+    Args:
+    results (dict): Results of the current run
+    baseline (dict): Results of the baseline run
+    threshold (float): Allowed relative slowdown, e.g. 0.2 for 20 %
+
+    Returns:
+    list of tuple: (key, baseline seconds, current seconds) for each regressed case
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None or min(previous["seconds"], current["seconds"]) < MIN_COMPARABLE_SECONDS:
+            continue
+        if current["seconds"] > previous["seconds"] * (1 + threshold):
+            regressions.append((key, previous["seconds"], current["seconds"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the ex1 books, mechanics and beam pipelines.")
+    parser.add_argument("--sizes", nargs="+", type=float, default=DEFAULT_SIZES,
+                        help="rows or loads per generated file, e.g. 1e3 1e5 1e8")
+    parser.add_argument("--repeat", type=int, default=3, help="minimum timed calls per case")
+    parser.add_argument("--cases", default="*", help="shell-style filter on case names")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON history file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument("--label", default="", help="free-form note stored with the run")
+    parser.add_argument("--set-baseline", action="store_true", help="make this run the new baseline")
+    parser.add_argument("--workdir", default=None, help="directory for generated input files")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the data generators")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes]
+    results = run_benchmarks(sizes, args.repeat, args.cases, args.workdir, args.seed)
+
+    history = load_history(args.history)
+    run_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    history["runs"].append({
+        "id": run_id,
+        "label": args.label,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    })
+
+    baseline = next((run for run in history["runs"] if run["id"] == history["baseline"]), None)
+    regressions = []
+    if baseline is not None and not args.set_baseline:
+        regressions = find_regressions(results, baseline["results"], args.threshold)
+    if baseline is None or args.set_baseline:
+        history["baseline"] = run_id
+        print(f"Run {run_id} recorded as the baseline.")
+    save_history(args.history, history)
+
+    for key, previous, current in regressions:
+        print(f"REGRESSION {key}: {previous * 1e3:.3f} ms -> {current * 1e3:.3f} ms")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
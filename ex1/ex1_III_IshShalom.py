@@ -1,6 +1,24 @@
 import csv
 import math
 
+import results_io
+from beam_sections import Section, rectangle
+from instrumentation import instrument
+from results_io import Field, ResultSchema
+
+BEAM_RESULTS = ResultSchema("beam", [
+    Field("max_bending_stress", "Max_bending_stress Data", "scalar"),
+    Field("max_shear_stress", "Max_shear_stress Data", "scalar"),
+    Field("max_deflection", "Max_deflection Data", "scalar"),
+    Field("loads", "Loads Data", "series", ("Position (m)", "Load (N)")),
+])
+
+LOAD_HEADER = ["position", "magnitude"]
+
+def _is_load_header(row):
+    return [cell.strip().lower() for cell in row] == LOAD_HEADER
+
+@instrument(rows=lambda result, filename: len(result[4]))
 def read_beam_data(filename):
     """
     Read beam data from a CSV file.
@@ -20,15 +38,20 @@ def read_beam_data(filename):
 
         loads = []
 
-        next(csv_reader)  
+        for index, row in enumerate(csv_reader):
+            if index == 0 and _is_load_header(row):
+                continue  # optional position,magnitude header
 
-        for row in csv_reader:
-            position = float(row[0])
-            magnitude = float(row[1])
+            try:
+                position, magnitude = map(float, row)
+            except ValueError:
+                raise ValueError(f"Invalid load row {','.join(row)!r} in {filename}; "
+                                 f"expected position,magnitude.") from None
             loads.append((position, magnitude))
 
     return length, width, height, elastic_modulus, loads
 
+@instrument(rows=1)
 def calculate_bending_moment(length, loads):
     """
     Calculate the maximum bending moment in the beam.
@@ -54,6 +77,7 @@ def calculate_bending_moment(length, loads):
 
     return max_bending_moment
 
+@instrument(rows=1)
 def calculate_shear_force(length, loads):
     """
     Calculate the maximum shear force in the beam.
@@ -81,18 +105,29 @@ def calculate_shear_force(length, loads):
 
     return max_shear_force
 
-def calculate_max_bending_stress(max_moment, moment_of_inertia, y_max):
+@instrument()
+def calculate_max_bending_stress(max_moment, moment_of_inertia, y_max=None):
     """
     Calculate the maximum bending stress in the beam.
     
     Args:
     max_moment (float): Maximum bending moment
-    moment_of_inertia (float): Moment of inertia of the beam cross-section
-    y_max (float): Distance from neutral axis to extreme fiber
+    moment_of_inertia (float or Section): Moment of inertia of the beam cross-section,
+        or a Section whose properties are used instead
+    y_max (float): Distance from neutral axis to extreme fiber; required with a float
+        moment_of_inertia and not allowed with a Section
     
     Returns:
     float: Maximum bending stress
     """
+    if isinstance(moment_of_inertia, Section):
+        if y_max is not None:
+            raise ValueError("Pass either a Section or moment_of_inertia and y_max, not both.")
+        section = moment_of_inertia
+        moment_of_inertia, y_max = section.moment_of_inertia, section.y_max
+    elif y_max is None:
+        raise ValueError("y_max is required unless a Section is passed.")
+
     if moment_of_inertia == 0:
         raise ValueError("Moment of inertia cannot be zero.")
 
@@ -100,19 +135,30 @@ def calculate_max_bending_stress(max_moment, moment_of_inertia, y_max):
 
     return max_bending_stress
 
-def calculate_max_shear_stress(max_shear, first_moment, moment_of_inertia, width):
+@instrument()
+def calculate_max_shear_stress(max_shear, first_moment, moment_of_inertia=None, width=None):
     """
     Calculate the maximum shear stress in the beam.
     
     Args:
     max_shear (float): Maximum shear force
-    first_moment (float): First moment of area of the beam cross-section
+    first_moment (float or Section): First moment of area of the beam cross-section,
+        or a Section whose properties are used instead
     moment_of_inertia (float): Moment of inertia of the beam cross-section
     width (float): Width of the beam at the neutral axis
+        (both required with a float first_moment and not allowed with a Section)
     
     Returns:
     float: Maximum shear stress
     """
+    if isinstance(first_moment, Section):
+        if moment_of_inertia is not None or width is not None:
+            raise ValueError("Pass either a Section or first_moment, moment_of_inertia and width, not both.")
+        section = first_moment
+        first_moment, moment_of_inertia, width = section.first_moment, section.moment_of_inertia, section.width
+    elif moment_of_inertia is None or width is None:
+        raise ValueError("moment_of_inertia and width are required unless a Section is passed.")
+
     if moment_of_inertia == 0:
         raise ValueError("Moment of inertia cannot be zero.")
     if width == 0:
@@ -122,6 +168,7 @@ def calculate_max_shear_stress(max_shear, first_moment, moment_of_inertia, width
 
     return max_shear_stress
 
+@instrument(rows=1)
 def calculate_max_deflection(length, loads, elastic_modulus, moment_of_inertia):
     """
     Calculate the maximum deflection of the beam.
@@ -130,11 +177,15 @@ def calculate_max_deflection(length, loads, elastic_modulus, moment_of_inertia):
     length (float): Length of the beam
     loads (list): List of (position, magnitude) tuples for each load
     elastic_modulus (float): Elastic modulus of the beam material
-    moment_of_inertia (float): Moment of inertia of the beam cross-section
+    moment_of_inertia (float or Section): Moment of inertia of the beam cross-section,
+        or a Section whose moment of inertia is used instead
     
     Returns:
     float: Maximum deflection
     """
+    if isinstance(moment_of_inertia, Section):
+        moment_of_inertia = moment_of_inertia.moment_of_inertia
+
     max_deflection = 0
 
     for position, magnitude in loads:
@@ -150,41 +201,42 @@ def calculate_max_deflection(length, loads, elastic_modulus, moment_of_inertia):
 
     return max_deflection
 
-def write_results(filename, results_data):
+@instrument(rows=3)
+def analyze_beam(length, section, elastic_modulus, loads):
+    """
+    Run the full stress and deflection analysis for one beam.
+    
+    Args:
+    length (float): Length of the beam
+    section (Section): Cross-section properties of the beam
+    elastic_modulus (float): Elastic modulus of the beam material
+    loads (list): List of (position, magnitude) tuples for each load
+    
+    Returns:
+    dict: max_bending_stress, max_shear_stress and max_deflection
+    """
+    max_moment = calculate_bending_moment(length, loads)
+    max_shear = calculate_shear_force(length, loads)
+
+    return {
+        "max_bending_stress": calculate_max_bending_stress(max_moment, section),
+        "max_shear_stress": calculate_max_shear_stress(max_shear, section),
+        "max_deflection": calculate_max_deflection(length, loads, elastic_modulus, section)
+    }
+
+@instrument(rows=1)
+def write_results(filename, results_data, fmt=None, append=False):
     """
     Write calculation results to a CSV file.
     
     Args:
     filename (str): Name of the output CSV file
     results_data (dict): Dictionary containing results to be written
+    fmt (str): 'csv', 'json' or 'columnar'; inferred from the extension when omitted
+    append (bool): Add to an existing results file instead of replacing it
     """
     try:
-        with open(filename, mode='w', newline='') as file:
-            writer = csv.writer(file)
-
-            for key, value in results_data.items():
-                writer.writerow([key.capitalize() + " Data"])
-
-                if isinstance(value, list) and all(isinstance(item, tuple) for item in value):
-                    if key == "velocity":
-                        writer.writerow(["Time (s)", "Velocity (m/s)"])
-                    elif key == "acceleration":
-                        writer.writerow(["Time (s)", "Acceleration (m/s^2)"])
-                    elif key == "loads":
-                        writer.writerow(["Position (m)", "Load (N)"])
-
-                    for item in value:
-                        writer.writerow(item)
-
-                elif isinstance(value, tuple) and len(value) == 2:
-                    writer.writerow(["Time (s)", "Value"])
-                    writer.writerow(value)
-
-                else:
-                    writer.writerow([str(value)])
-
-                writer.writerow([])
-
+        results_io.write_results(filename, results_data, BEAM_RESULTS, fmt=fmt, append=append)
         print(f"Results successfully written to {filename}")
     except Exception as e:
         print(f"An error occurred while writing results: {e}")
@@ -198,23 +250,10 @@ def main():
         length, width, height, elastic_modulus, loads = read_beam_data(input_file)
 
         # Calculate beam properties
-        moment_of_inertia = (width * height**3) / 12
-        y_max = height / 2
-        first_moment = (width * height**2) / 8
+        section = rectangle(width, height)
 
         # Perform calculations
-        max_moment = calculate_bending_moment(length, loads)
-        max_shear = calculate_shear_force(length, loads)
-        max_bending_stress = calculate_max_bending_stress(max_moment, moment_of_inertia, y_max)
-        max_shear_stress = calculate_max_shear_stress(max_shear, first_moment, moment_of_inertia, width)
-        max_deflection = calculate_max_deflection(length, loads, elastic_modulus, moment_of_inertia)
-
-        # Prepare results
-        results = {
-            "max_bending_stress": max_bending_stress,
-            "max_shear_stress": max_shear_stress,
-            "max_deflection": max_deflection
-        }
+        results = analyze_beam(length, section, elastic_modulus, loads)
 
         # Write results to file
         write_results(output_file, results)
@@ -1,5 +1,17 @@
 import csv
 
+import results_io
+from instrumentation import instrument
+from results_io import Field, ResultSchema
+
+MECHANICS_RESULTS = ResultSchema("mechanics", [
+    Field("velocity", "Velocity Data", "series", ("Time (s)", "Velocity (m/s)")),
+    Field("acceleration", "Acceleration Data", "series", ("Time (s)", "Acceleration (m/s^2)")),
+    Field("max_force", "Maximum Force", "record", ("Time (s)", "Max Force (N)")),
+    Field("work_done", "Work Done", "scalar", ("Total Work Done (Joules)",)),
+])
+
+@instrument()
 def read_mechanical_data(filename):
     """
     Read mechanical data from a CSV file.
@@ -29,6 +41,7 @@ def read_mechanical_data(filename):
     return data_tuples
     
 
+@instrument()
 def calculate_velocity(position_data, time_step):
     """
     Calculate velocity from position data.
@@ -51,6 +64,7 @@ def calculate_velocity(position_data, time_step):
     return veloctiy_data
 
 
+@instrument()
 def calculate_acceleration(velocity_data, time_step):
     """
     Calculate acceleration from velocity data.
@@ -73,6 +87,7 @@ def calculate_acceleration(velocity_data, time_step):
     return acceleration_data
 
 
+@instrument(rows=0)
 def find_max_force(force_data):
     """
     Find the maximum force applied to the system.
@@ -88,6 +103,7 @@ def find_max_force(force_data):
     return time_of_max_force, max_force
     
 
+@instrument(rows=0)
 def calculate_work_done(force_data, position_data):
     """
     Calculate the total work done on the system.
@@ -111,50 +127,19 @@ def calculate_work_done(force_data, position_data):
     return work_done
 
 
-def write_results(filename, results_data):
+@instrument(rows=1)
+def write_results(filename, results_data, fmt=None, append=False):
     """
     Write calculation results to a CSV file.
     
     Args:
     filename (str): Name of the output CSV file
     results_data (dict): Dictionary containing results to be written
+    fmt (str): 'csv', 'json' or 'columnar'; inferred from the extension when omitted
+    append (bool): Add to an existing results file instead of replacing it
     """
     try:
-        # Open the file in write mode
-        with open(filename, mode='w', newline='') as file:
-            writer = csv.writer(file)
-
-            # Write headers for each section and then the corresponding data
-            
-            # Write Velocity Data
-            writer.writerow(["Velocity Data"])
-            writer.writerow(["Time (s)", "Velocity (m/s)"])
-            for time, velocity in results_data["velocity"]:
-                writer.writerow([time, velocity])
-
-            writer.writerow([])  # Empty row for separation
-
-            # Write Acceleration Data
-            writer.writerow(["Acceleration Data"])
-            writer.writerow(["Time (s)", "Acceleration (m/s^2)"])
-            for time, acceleration in results_data["acceleration"]:
-                writer.writerow([time, acceleration])
-
-            writer.writerow([])  # Empty row for separation
-
-            # Write Maximum Force Data
-            writer.writerow(["Maximum Force"])
-            writer.writerow(["Time (s)", "Max Force (N)"])
-            max_force_time, max_force = results_data["max_force"]
-            writer.writerow([max_force_time, max_force])
-
-            writer.writerow([])  # Empty row for separation
-
-            # Write Work Done
-            writer.writerow(["Work Done"])
-            writer.writerow(["Total Work Done (Joules)"])
-            writer.writerow([results_data["work_done"]])
-
+        results_io.write_results(filename, results_data, MECHANICS_RESULTS, fmt=fmt, append=append)
         print(f"Results successfully written to {filename}")
     except Exception as e:
         print(f"An error occurred while writing results: {e}")
@@ -1,6 +1,25 @@
 import csv
 import json
 
+import results_io
+from instrumentation import instrument
+from results_io import Field, ResultSchema
+
+BOOK_COLUMNS = ("Title", "Author", "Year", "Genre", "Price ($)", "Discounted Price ($)")
+BOOK_KEYS = ("title", "author", "year", "genre", "price", "discounted_price")
+
+# Properties read from the CSV as strings that sort_books compares as numbers
+NUMERIC_PROPERTIES = {"year": int, "price": float, "discounted_price": float}
+
+BOOK_RESULTS = ResultSchema("books", [
+    Field("most_prolific_author", "Most Prolific Author", "scalar", ("Author",)),
+    Field("unique_genres", "Unique Genres", "series", ("Genre",)),
+    Field("average_price_by_genre", "Average Price by Genre", "series", ("Genre", "Average Price ($)")),
+    Field("recent_books", "Recent Books", "table", BOOK_COLUMNS, BOOK_KEYS),
+    Field("books_by_price", "Books by Price", "table", BOOK_COLUMNS, BOOK_KEYS),
+])
+
+@instrument()
 def load_book_data(filename):
     """
     Read book data from a CSV file.
@@ -14,6 +33,7 @@ def load_book_data(filename):
         dict_list = [row for row in csv_reader]
     return dict_list
 
+@instrument()
 def calculate_discount_price(books, discount_rate):
     """
     Calculate and add discounted price for each book.
@@ -30,6 +50,7 @@ def calculate_discount_price(books, discount_rate):
     return books
     
 
+@instrument(rows=0)
 def find_unique_genres(books):
     """
     Find unique genres from the data.
@@ -45,6 +66,7 @@ def find_unique_genres(books):
     return genres
     pass
 
+@instrument(rows=0)
 def filter_books_by_year(books, start_year, end_year):
     """
     Filter books based on publication year range.
@@ -63,9 +85,11 @@ def filter_books_by_year(books, start_year, end_year):
             
     
 
+@instrument()
 def sort_books(books, sort_by, reverse=False):
     """
     Sort books based on a specified property.
+    Numeric properties (year, price, discounted_price) are compared by value.
     Args:
         books (list of dict): List of book dictionaries
         sort_by (str): Property to sort by
@@ -73,9 +97,14 @@ def sort_books(books, sort_by, reverse=False):
     Returns:
         list of dict: Sorted list of book dictionaries
     """
-    sorted_books = sorted(books, key=lambda book: book.get(sort_by), reverse=reverse)
+    convert = NUMERIC_PROPERTIES.get(sort_by)
+    if convert is None:
+        sorted_books = sorted(books, key=lambda book: book.get(sort_by), reverse=reverse)
+    else:
+        sorted_books = sorted(books, key=lambda book: convert(book[sort_by]), reverse=reverse)
     return sorted_books
 
+@instrument(rows=0)
 def find_most_prolific_author(books):
     """
     Find the author with the most books in the dataset.
@@ -95,6 +124,7 @@ def find_most_prolific_author(books):
     else:
         return None
 
+@instrument(rows=0)
 def calculate_average_price_by_genre(books):
     """
     Calculate average book price for each genre.
@@ -122,6 +152,7 @@ def calculate_average_price_by_genre(books):
     return average_price_by_genre
         
 
+@instrument(rows=0)
 def generate_book_report(books, output_filename):
     """
     Generate a formatted report of books and their properties.
@@ -150,6 +181,24 @@ def generate_book_report(books, output_filename):
         print(f"An error occurred while generating the report: {e}")
 
 
+@instrument(rows=1)
+def write_results(filename, results_data, fmt=None, append=False):
+    """
+    Write analysis results to a CSV file.
+    Args:
+        filename (str): Name of the output CSV file
+        results_data (dict): Dictionary containing results to be written
+        fmt (str): 'csv', 'json' or 'columnar'; inferred from the extension when omitted
+        append (bool): Add to an existing results file instead of replacing it
+    """
+    try:
+        results_io.write_results(filename, results_data, BOOK_RESULTS, fmt=fmt, append=append)
+        print(f"Results successfully written to {filename}")
+    except Exception as e:
+        print(f"An error occurred while writing results: {e}")
+
+
+@instrument()
 def update_book_properties(books, updates):
     """
     Update book properties based on provided updates.
@@ -172,6 +221,7 @@ def update_book_properties(books, updates):
                     print(f"Warning: Property '{key}' not found in book '{title}'. Skipping this update.")
     return books
 
+@instrument()
 def convert_currency(books, exchange_rate):
     """
     Convert book prices to a different currency.
@@ -199,6 +249,7 @@ def convert_currency(books, exchange_rate):
 def main():
     input_file = "books.csv"
     output_file = "book_analysis_report.txt"
+    results_file = "book_analysis_results.csv"
     
     try:
         # Load data
@@ -218,6 +269,13 @@ def main():
         
         # Generate report
         generate_book_report(books, output_file)
+        write_results(results_file, {
+            "most_prolific_author": top_author,
+            "unique_genres": sorted(unique_genres),
+            "average_price_by_genre": sorted(avg_prices.items()),
+            "recent_books": recent_books,
+            "books_by_price": sorted_books
+        })
         
         # Perform updates and conversions
         updates = {'Book 1': {'year': 1960}, 'Book 2': {'price': 12.99}}
@@ -0,0 +1,363 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+PROFILE_ENV = "ME371_PROFILE"
+FORMAT_ENV = "ME371_PROFILE_FORMAT"
+ALLOC_ENV = "ME371_PROFILE_ALLOC"
+MAX_EVENTS = 100000
+
+_enabled = False
+_trace_allocations = False
+tracemalloc = None  # imported by enable(trace_allocations=True) to keep plain imports cheap
+_lock = threading.Lock()
+_stats = {}
+_events = []
+_open_spans = []  # spans measuring allocations, in every thread
+_origin = time.perf_counter()
+
+
+def enable(trace_allocations=False):
+    """
+    Start recording instrumented calls.
+
+    Args:
+    trace_allocations (bool): Also record allocation stats through tracemalloc,
+        which slows down every allocation while it is active
+    """
+    global _enabled, _trace_allocations, tracemalloc
+    _trace_allocations = trace_allocations
+    if trace_allocations:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    _enabled = True
+
+
+def disable():
+    """Stop recording; collected stats are kept until reset()."""
+    global _enabled, _trace_allocations
+    _enabled = False
+    if _trace_allocations and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _trace_allocations = False
+
+
+def is_enabled():
+    """Return True while calls are being recorded."""
+    return _enabled
+
+
+def reset():
+    """Drop all collected stats and trace events."""
+    global _origin
+    with _lock:
+        _stats.clear()
+        _events.clear()
+        _origin = time.perf_counter()
+
+
+def _count_rows(rows, result, args, kwargs):
+    try:
+        if callable(rows):
+            return rows(result, *args, **kwargs)
+        if isinstance(rows, int):
+            return len(args[rows])
+        if rows is None and hasattr(result, "__len__") and not isinstance(result, str):
+            return len(result)
+    except (TypeError, IndexError):
+        pass
+    return None
+
+
+def _record(name, start, wall, cpu, rows, allocated, peak):
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "rows": 0,
+                                    "allocated_bytes": 0, "peak_bytes": 0}
+        entry["calls"] += 1
+        entry["wall_seconds"] += wall
+        entry["cpu_seconds"] += cpu
+        if rows is not None:
+            entry["rows"] += rows
+        if allocated is not None:
+            entry["allocated_bytes"] += allocated
+            entry["peak_bytes"] = max(entry["peak_bytes"], peak)
+
+        if len(_events) < MAX_EVENTS:
+            event_args = {"cpu_ms": cpu * 1e3}
+            if rows is not None:
+                event_args["rows"] = rows
+            if allocated is not None:
+                event_args["allocated_bytes"] = allocated
+                event_args["peak_bytes"] = peak
+            _events.append({"name": name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+                            "ts": (start - _origin) * 1e6, "dur": wall * 1e6, "args": event_args})
+
+
+class Span:
+    """
+    Measurement of one instrumented block; set ``rows`` inside the block to report throughput.
+    """
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self._memory = None
+        self._peak_total = 0
+
+    def __enter__(self):
+        if _trace_allocations:
+            # tracemalloc has one process-wide peak; fold it into the spans that
+            # are still open before resetting it so their peaks are not lost.
+            with _lock:
+                current, peak_total = tracemalloc.get_traced_memory()
+                for outer in _open_spans:
+                    outer._peak_total = max(outer._peak_total, peak_total)
+                tracemalloc.reset_peak()
+                self._memory = self._peak_total = current
+                _open_spans.append(self)
+        self._cpu = time.process_time()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._start
+        cpu = time.process_time() - self._cpu
+        allocated = peak = None
+        if self._memory is not None:
+            with _lock:
+                _open_spans.remove(self)
+                if tracemalloc.is_tracing():
+                    current, peak_total = tracemalloc.get_traced_memory()
+                    allocated = current - self._memory
+                    peak = max(peak_total, self._peak_total) - self._memory
+        _record(self.name, self._start, wall, cpu, self.rows, allocated, peak)
+        return False
+
+
+class _NullSpan:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, rows=None):
+    """
+    Context manager that records the enclosed block under ``name`` when enabled.
+
+    Args:
+    name (str): Name the block is reported under
+    rows (int): Rows processed, if known up front
+
+    Returns:
+    Span: Measurement whose ``rows`` may be set inside the block
+    """
+    return Span(name, rows) if _enabled else _NULL_SPAN
+
+
+def instrument(name=None, rows=None):
+    """
+    Decorator recording call counts, wall/CPU time, rows and allocations of a function.
+
+    When instrumentation is disabled the wrapper only checks a module flag
+    before calling through.
+
+    Args:
+    name (str): Name the function is reported under; defaults to <module file>.<function>, so
+        names are the same whether the module is imported or run as a script
+    rows: How to count processed rows: None uses len(result) when available,
+        an int uses len() of that positional argument, a callable is called as
+        rows(result, *args, **kwargs)
+    """
+    def decorate(func):
+        module = os.path.splitext(os.path.basename(func.__code__.co_filename))[0]
+        label = name or f"{module}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            measured = Span(label)
+            with measured:
+                result = func(*args, **kwargs)
+                measured.rows = _count_rows(rows, result, args, kwargs)
+            return result
+
+        return wrapper
+    return decorate
+
+
+def instrument_iter(name=None):
+    """
+    Decorator for generator functions: records the time spent producing items
+    (not the time the consumer spends between them) and the number of items,
+    as one call once the generator is exhausted or closed.
+
+    Args:
+    name (str): Name the generator is reported under; defaults as for instrument()
+    """
+    def decorate(func):
+        module = os.path.splitext(os.path.basename(func.__code__.co_filename))[0]
+        label = name or f"{module}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            return _measured_iter(label, func(*args, **kwargs))
+
+        return wrapper
+    return decorate
+
+
+def _measured_iter(label, iterator):
+    start = time.perf_counter()
+    wall = cpu = 0.0
+    rows = 0
+    try:
+        while True:
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            try:
+                item = next(iterator)
+            finally:
+                wall += time.perf_counter() - wall_start
+                cpu += time.process_time() - cpu_start
+            rows += 1
+            yield item
+    except StopIteration:
+        pass
+    finally:
+        if hasattr(iterator, "close"):
+            iterator.close()
+        _record(label, start, wall, cpu, rows, None, None)
+
+
+def worker_options():
+    """
+    Keyword arguments for ProcessPoolExecutor that make its workers record
+    like this process; submit work through call_measured() and read results
+    with collect() so the workers' data ends up here.
+    """
+    return {"initializer": _init_worker, "initargs": (_enabled, _trace_allocations)}
+
+
+def _init_worker(enabled, trace_allocations):
+    reset()  # forked workers start with a copy of the parent's data
+    if enabled:
+        enable(trace_allocations)
+    else:
+        disable()
+
+
+def call_measured(func, *args):
+    """
+    Call func(*args) in a pool worker.
+
+    Returns:
+    tuple: (result, data recorded during the call or None), for collect()
+    """
+    result = func(*args)
+    if not _enabled:
+        return result, None
+    with _lock:
+        data = {"origin": _origin, "stats": dict(_stats), "events": list(_events)}
+        _stats.clear()
+        _events.clear()
+    return result, data
+
+
+def collect(future):
+    """Result of a call_measured() future, merging the worker's data into this process."""
+    result, data = future.result()
+    if data is not None:
+        _merge(data)
+    return result
+
+
+def _merge(data):
+    shift = (data["origin"] - _origin) * 1e6  # perf_counter is shared by the processes of one machine
+    with _lock:
+        for name, worker_entry in data["stats"].items():
+            entry = _stats.get(name)
+            if entry is None:
+                _stats[name] = dict(worker_entry)
+                continue
+            for field in ("calls", "wall_seconds", "cpu_seconds", "rows", "allocated_bytes"):
+                entry[field] += worker_entry[field]
+            entry["peak_bytes"] = max(entry["peak_bytes"], worker_entry["peak_bytes"])
+        for event in data["events"][:MAX_EVENTS - len(_events)]:
+            _events.append({**event, "ts": event["ts"] + shift})
+
+
+def summary():
+    """
+    Aggregated stats per instrumented name.
+
+    Returns:
+    dict: name -> calls, wall_seconds, cpu_seconds, rows, rows_per_second,
+    allocated_bytes and peak_bytes
+    """
+    with _lock:
+        report = {}
+        for label, entry in _stats.items():
+            entry = dict(entry)
+            entry["rows_per_second"] = entry["rows"] / entry["wall_seconds"] if entry["wall_seconds"] else None
+            report[label] = entry
+        return report
+
+
+def export_json(filename):
+    """Write summary() as JSON."""
+    with open(filename, mode='w') as file:
+        json.dump(summary(), file, indent=2)
+
+
+def export_chrome_trace(filename):
+    """Write the recorded calls in Chrome trace-event format (chrome://tracing, Perfetto)."""
+    with _lock:
+        events = list(_events)
+    with open(filename, mode='w') as file:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+
+
+def export(filename, fmt="json"):
+    """
+    Write the collected data.
+
+    Args:
+    filename (str): Output file name
+    fmt (str): 'json' for the summary or 'chrome' for a trace
+    """
+    if fmt == "chrome":
+        export_chrome_trace(filename)
+    elif fmt == "json":
+        export_json(filename)
+    else:
+        raise ValueError(f"Unknown instrumentation format '{fmt}'.")
+
+
+def _enable_from_environment():
+    output = os.environ.get(PROFILE_ENV)
+    if not output:
+        return
+    import multiprocessing
+    if multiprocessing.parent_process() is not None:
+        return  # a pool worker; its data is sent back to the parent, which writes the file
+    enable(trace_allocations=os.environ.get(ALLOC_ENV, "") not in ("", "0"))
+    atexit.register(export, output, os.environ.get(FORMAT_ENV, "json"))
+
+
+_enable_from_environment()
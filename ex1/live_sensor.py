@@ -0,0 +1,428 @@
+import argparse
+import asyncio
+import csv
+import os
+import signal
+import sys
+import time
+
+FIELDS = ("time", "position", "force")
+RESULT_COLUMNS = ("time", "position", "force", "velocity", "acceleration",
+                  "max_force_time", "max_force", "work_done")
+
+
+class KinematicsState:
+    """
+    Incremental version of the ex1_II computations.
+
+    Each update costs O(1) and reproduces calculate_velocity,
+    calculate_acceleration, find_max_force and calculate_work_done on the
+    samples received so far.
+    """
+
+    def __init__(self, time_step=None):
+        """
+        Args:
+        time_step (float): Fixed time step as in ex1_II; None uses the
+            difference between consecutive sample times
+        """
+        self.time_step = time_step
+        self.samples = 0
+        self.previous = None
+        self.velocity = None
+        self.acceleration = None
+        self.max_force = None
+        self.work_done = 0.0
+
+    def update(self, sample):
+        """
+        Add one (time, position, force) sample.
+
+        Returns:
+        dict: Latest sample with its derived quantities; velocity and
+        acceleration are None until enough samples have arrived
+        """
+        t, position, force = sample
+        velocity = acceleration = None
+
+        if self.previous is not None:
+            previous_time, previous_position, _ = self.previous
+            dt = self.time_step or (t - previous_time)
+            if dt <= 0:
+                raise ValueError(f"Sample times must increase, got {previous_time} then {t}.")
+            velocity = (position - previous_position) / dt
+            if self.velocity is not None:
+                acceleration = (velocity - self.velocity) / dt
+            self.work_done += force * (position - previous_position)
+
+        if self.max_force is None or force > self.max_force[1]:
+            self.max_force = (t, force)
+
+        self.previous = sample
+        self.velocity = velocity
+        self.acceleration = acceleration
+        self.samples += 1
+
+        return {"time": t, "position": position, "force": force, "velocity": velocity,
+                "acceleration": acceleration, "max_force_time": self.max_force[0],
+                "max_force": self.max_force[1], "work_done": self.work_done}
+
+
+def parse_sample(line):
+    """
+    Parse a 'time,position,force' line.
+
+    Returns:
+    tuple: (time, position, force), or None for headers, blank and invalid lines
+    """
+    parts = line.strip().split(",")
+    if len(parts) != len(FIELDS):
+        return None
+    try:
+        return tuple(float(part) for part in parts)
+    except ValueError:
+        return None
+
+
+class LiveKinematicsService:
+    """
+    Asyncio service that turns a stream of samples into rolling kinematics results.
+
+    Samples flow through a bounded ingest queue into a single processor task,
+    which publishes each update to every subscriber. Blocking subscribers
+    apply backpressure: when one is full the processor waits, the ingest queue
+    fills and the sources stop reading (which, for sockets, lets TCP flow
+    control throttle the sender).
+    """
+
+    def __init__(self, time_step=None, queue_size=1000):
+        self.state = KinematicsState(time_step)
+        self.ingest = asyncio.Queue(maxsize=queue_size)
+        self.subscribers = []
+        self.invalid_lines = 0
+        self.invalid_samples = 0
+        self.finished = asyncio.Event()
+        self.latency_max = 0.0
+        self.latency_total = 0.0
+        self.dropped = 0
+
+    def subscribe(self, maxsize=100, drop_oldest=False):
+        """
+        Register a subscriber.
+
+        Args:
+        maxsize (int): Capacity of the subscriber queue
+        drop_oldest (bool): When full, discard the oldest update instead of
+            blocking the service; for displays that only need recent values
+
+        Returns:
+        asyncio.Queue: Receives update dicts, then None when the service stops;
+        pass it to unsubscribe() if its consumer stops reading before that
+        """
+        queue = asyncio.Queue(maxsize=maxsize)
+        self.subscribers.append((queue, drop_oldest))
+        return queue
+
+    def unsubscribe(self, queue):
+        """Stop publishing to a subscriber queue, e.g. because its consumer failed."""
+        self.subscribers = [(other, drop_oldest) for other, drop_oldest in self.subscribers
+                            if other is not queue]
+        while not queue.empty():
+            queue.get_nowait()  # wake the processor if it is waiting for room in this queue
+
+    async def feed_line(self, line):
+        """
+        Parse one line and queue it, waiting while the ingest queue is full.
+        Lines arriving after the processor has stopped are discarded.
+        """
+        sample = parse_sample(line)
+        if sample is None:
+            if line.strip() and not line.lstrip().startswith(FIELDS[0]):
+                self.invalid_lines += 1
+            return
+        if not self.finished.is_set():
+            await self.ingest.put((time.perf_counter(), sample))
+
+    async def _publish(self, update):
+        for queue, drop_oldest in list(self.subscribers):
+            if drop_oldest and queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            await queue.put(update)
+
+    def _end_subscribers(self):
+        """Send None to every subscriber without waiting, dropping its oldest update if full."""
+        for queue, drop_oldest in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(None)
+
+    async def process(self):
+        """
+        Consume the ingest queue until a None sentinel arrives.
+
+        Samples the state rejects, such as a repeated or out-of-order time, are
+        counted in invalid_samples and skipped. Subscribers receive None when
+        processing ends; if it ends with an error or is cancelled, None is
+        delivered without waiting, in place of the oldest pending update.
+        """
+        ended = False
+        try:
+            while True:
+                item = await self.ingest.get()
+                if item is None:
+                    break
+                received, sample = item
+                try:
+                    update = self.state.update(sample)
+                except ValueError as e:
+                    self.invalid_samples += 1
+                    print(f"Skipped sample {sample}: {e}")
+                    continue
+                await self._publish(update)
+                latency = time.perf_counter() - received
+                self.latency_total += latency
+                self.latency_max = max(self.latency_max, latency)
+            await self._publish(None)
+            ended = True
+        finally:
+            self.finished.set()
+            while not self.ingest.empty():
+                self.ingest.get_nowait()  # wake sources blocked on a full queue
+            if not ended:
+                self._end_subscribers()
+
+    async def stop(self):
+        """Let the processor finish the queued samples and stop; returns at once if it already has."""
+        if self.finished.is_set():
+            return
+        put = asyncio.ensure_future(self.ingest.put(None))
+        finished = asyncio.ensure_future(self.finished.wait())
+        await asyncio.wait((put, finished), return_when=asyncio.FIRST_COMPLETED)
+        put.cancel()
+        finished.cancel()
+
+    def stats(self):
+        """
+        Service counters.
+
+        Returns:
+        dict: samples, invalid_lines, invalid_samples, dropped updates and
+        per-sample latency in seconds
+        """
+        samples = self.state.samples
+        return {"samples": samples, "invalid_lines": self.invalid_lines,
+                "invalid_samples": self.invalid_samples, "dropped": self.dropped,
+                "latency_mean": self.latency_total / samples if samples else 0.0,
+                "latency_max": self.latency_max}
+
+
+async def tail_file(service, filename, follow=True, poll_interval=0.1):
+    """
+    Feed the service with lines of a file, optionally waiting for new ones like 'tail -f'.
+
+    Args:
+    service (LiveKinematicsService): Service to feed
+    filename (str): File written by the test rig
+    follow (bool): Keep waiting for appended lines instead of stopping at end of file
+    poll_interval (float): Seconds between checks for new data
+    """
+    with open(filename, mode='r') as file:
+        pending = ""
+        while True:
+            chunk = file.readline()
+            if not chunk:
+                if not follow:
+                    break
+                await asyncio.sleep(poll_interval)
+                continue
+            pending += chunk
+            if pending.endswith("\n"):
+                await service.feed_line(pending)
+                pending = ""
+        if pending:
+            await service.feed_line(pending)
+
+
+async def serve_socket(service, host="127.0.0.1", port=8765, path=None):
+    """
+    Accept sample lines over TCP, or over a Unix socket when path is given.
+
+    Returns:
+    asyncio.Server: The listening server
+    """
+    async def handle(reader, writer):
+        try:
+            async for line in reader:
+                await service.feed_line(line.decode(errors="replace"))
+        finally:
+            writer.close()
+
+    if path is not None:
+        return await asyncio.start_unix_server(handle, path=path)
+    return await asyncio.start_server(handle, host, port)
+
+
+async def write_rolling_results(queue, filename, flush_every=100):
+    """
+    Subscriber that appends every update to a CSV file.
+
+    Args:
+    queue (asyncio.Queue): Queue returned by LiveKinematicsService.subscribe()
+    filename (str): Output CSV file
+    flush_every (int): Updates between flushes to disk
+    """
+    new_file = not os.path.exists(filename) or os.path.getsize(filename) == 0
+    with open(filename, mode='a', newline='') as file:
+        writer = csv.writer(file)
+        if new_file:
+            writer.writerow(RESULT_COLUMNS)
+        count = 0
+        while True:
+            update = await queue.get()
+            if update is None:
+                break
+            writer.writerow([update[column] for column in RESULT_COLUMNS])
+            count += 1
+            if count % flush_every == 0:
+                file.flush()
+                await asyncio.sleep(0)
+
+
+async def replay_csv(filename, rate=10.0, host="127.0.0.1", port=8765, path=None, output=None):
+    """
+    Stream an existing mechanical_data.csv at a fixed sample rate, for testing.
+
+    Samples go to a TCP or Unix socket, or are appended to the output file
+    when one is given (to exercise tail mode).
+
+    Args:
+    filename (str): CSV file with time, position, force columns
+    rate (float): Samples per second; 0 sends as fast as possible
+    host (str): Host of the service
+    port (int): TCP port of the service
+    path (str): Unix socket path of the service
+    output (str): File to append to instead of connecting to a socket
+    """
+    interval = 1 / rate if rate else 0
+    with open(filename, mode='r') as source:
+        lines = [line for line in source if parse_sample(line) is not None]
+
+    if output is not None:
+        with open(output, mode='a') as sink:
+            for line in lines:
+                sink.write(line if line.endswith("\n") else line + "\n")
+                sink.flush()
+                await asyncio.sleep(interval)
+        return
+
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for line in lines:
+            writer.write(line.encode() if line.endswith("\n") else (line + "\n").encode())
+            await writer.drain()
+            await asyncio.sleep(interval)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _run_source(service, args):
+    if args.tail:
+        await tail_file(service, args.tail, follow=not args.once)
+    else:
+        server = await serve_socket(service, args.host, args.port, args.unix)
+        async with server:
+            await server.serve_forever()
+
+
+async def _serve(args):
+    service = LiveKinematicsService(args.time_step, args.queue_size)
+    queue = service.subscribe(args.subscriber_queue)
+    writer = asyncio.create_task(write_rolling_results(queue, args.output))
+    writer.add_done_callback(lambda task: service.unsubscribe(queue))
+    processor = asyncio.create_task(service.process())
+    source = asyncio.create_task(_run_source(service, args))
+    tasks = (source, processor, writer)
+
+    def interrupt():
+        # The first signal stops reading and drains the queue; a second one stops everything.
+        if not source.done():
+            source.cancel()
+        else:
+            processor.cancel()
+            writer.cancel()
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, interrupt)
+        except (NotImplementedError, RuntimeError):
+            pass  # not supported on this platform; Ctrl-C still ends the run
+
+    try:
+        # Normally the source ends first; the processor or writer ending first means one failed.
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        if source.done() and not _failed(source):
+            await service.stop()
+            await asyncio.wait((processor, writer), return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    stats = service.stats()
+    print(f"Processed {stats['samples']} samples ({stats['invalid_samples']} skipped), "
+          f"mean latency {stats['latency_mean'] * 1e3:.3f} ms, max {stats['latency_max'] * 1e3:.3f} ms.")
+    errors = [task.exception() for task in tasks if _failed(task)]
+    if errors:
+        print(f"Live service failed: {errors[0]}", file=sys.stderr)
+        return 1
+    print(f"Results written to {args.output}")
+    return 0
+
+
+def _failed(task):
+    return task.done() and not task.cancelled() and task.exception() is not None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Live kinematics from a streaming test rig.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="ingest samples from a socket or a tailed file")
+    serve.add_argument("--tail", help="follow this file instead of listening on a socket")
+    serve.add_argument("--once", action="store_true", help="with --tail, stop at end of file")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    serve.add_argument("--time-step", type=float, default=None,
+                       help="fixed time step in s; default uses sample time differences")
+    serve.add_argument("--queue-size", type=int, default=1000)
+    serve.add_argument("--subscriber-queue", type=int, default=100)
+    serve.add_argument("--output", default="live_results.csv")
+
+    replay = commands.add_parser("replay", help="stream an existing CSV for testing")
+    replay.add_argument("input", nargs="?", default="mechanical_data.csv")
+    replay.add_argument("--rate", type=float, default=10.0, help="samples per second; 0 for no delay")
+    replay.add_argument("--host", default="127.0.0.1")
+    replay.add_argument("--port", type=int, default=8765)
+    replay.add_argument("--unix", help="connect to this Unix socket path")
+    replay.add_argument("--to-file", help="append to this file instead of connecting")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "serve":
+            sys.exit(asyncio.run(_serve(args)))
+        else:
+            asyncio.run(replay_csv(args.input, args.rate, args.host, args.port, args.unix, args.to_file))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+from beam_sections import Section
+
+QUANTITIES = ("shear", "moment", "deflection")
+
+
+def beam_stations(length, num_stations=101):
+    """
+    Evenly spaced evaluation points along the beam, both ends included.
+
+    Args:
+    length (float): Length of the beam
+    num_stations (int): Number of points
+
+    Returns:
+    list: Station positions
+    """
+    if num_stations < 2:
+        raise ValueError("At least two stations are required.")
+    step = length / (num_stations - 1)
+    return [i * step for i in range(num_stations)]
+
+
+def unit_case_diagrams(length, loads, elastic_modulus, moment_of_inertia, stations):
+    """
+    Shear, moment and deflection diagrams for a single load case.
+
+    The beam is treated as free at x = 0 and fixed at x = length: at station x
+    the shear and moment are the resultant and the moment of all loads at or
+    left of x, and the deflection is the cantilever elastic curve, positive in
+    the load direction.
+
+    Only the moment agrees with ex1_III (calculate_bending_moment). The other
+    two diverge on purpose, so that the three diagrams describe one beam:
+    calculate_shear_force adds the loads again at every station it visits, so
+    its maximum exceeds the resultant shear here, and calculate_max_deflection
+    uses the simply-supported point-load formula rather than the cantilever
+    curve.
+
+    Args:
+    length (float): Length of the beam
+    loads (list): List of (position, magnitude) tuples for each load
+    elastic_modulus (float): Elastic modulus of the beam material
+    moment_of_inertia (float or Section): Moment of inertia of the beam cross-section
+    stations (list): Positions at which the diagrams are evaluated
+
+    Returns:
+    dict: 'shear', 'moment' and 'deflection' lists aligned with stations
+    """
+    if isinstance(moment_of_inertia, Section):
+        moment_of_inertia = moment_of_inertia.moment_of_inertia
+    if moment_of_inertia == 0 or elastic_modulus == 0:
+        raise ValueError("Flexural rigidity cannot be zero.")
+
+    rigidity = 6 * elastic_modulus * moment_of_inertia
+    shear = [0.0] * len(stations)
+    moment = [0.0] * len(stations)
+    deflection = [0.0] * len(stations)
+
+    for position, magnitude in loads:
+        arm = length - position
+        for i, x in enumerate(stations):
+            from_fixed = length - x
+            if position <= x:
+                shear[i] += magnitude
+                moment[i] += magnitude * (x - position)
+                deflection[i] += magnitude * from_fixed**2 * (3 * arm - from_fixed) / rigidity
+            else:
+                deflection[i] += magnitude * arm**2 * (3 * from_fixed - arm) / rigidity
+
+    return {"shear": shear, "moment": moment, "deflection": deflection}
+
+
+def combine_cases(factors, case_values):
+    """
+    Form combination results as the matrix product factors x case_values.
+
+    Args:
+    factors (list of list): One row of case factors per combination
+    case_values (list of list): One row of station values per load case
+
+    Returns:
+    list of list: One row of station values per combination
+    """
+    num_stations = len(case_values[0]) if case_values else 0
+    combined = []
+    for row in factors:
+        if len(row) != len(case_values):
+            raise ValueError("Each combination needs exactly one factor per load case.")
+        values = [0.0] * num_stations
+        for factor, case_row in zip(row, case_values):
+            if factor:
+                values = [v + factor * c for v, c in zip(values, case_row)]
+        combined.append(values)
+    return combined
+
+
+def _envelope(names, combined):
+    maxima, minima, max_names, min_names = [], [], [], []
+    for column in zip(*combined):
+        high = max(range(len(column)), key=column.__getitem__)
+        low = min(range(len(column)), key=column.__getitem__)
+        maxima.append(column[high])
+        minima.append(column[low])
+        max_names.append(names[high])
+        min_names.append(names[low])
+    return {"max": maxima, "min": minima, "max_combination": max_names, "min_combination": min_names}
+
+
+def load_combination_envelope(length, cases, combinations, elastic_modulus, moment_of_inertia,
+                              num_stations=101):
+    """
+    Envelope of shear, moment and deflection over a set of factored load combinations.
+
+    Each load case is analyzed once; because the analysis is linear, every
+    combination is then a weighted sum of the unit-case diagrams.
+
+    Args:
+    length (float): Length of the beam
+    cases (dict): Load case name -> list of (position, magnitude) tuples
+    combinations (dict): Combination name -> {load case name: factor}
+    elastic_modulus (float): Elastic modulus of the beam material
+    moment_of_inertia (float or Section): Moment of inertia of the beam cross-section
+    num_stations (int): Number of evaluation points along the beam
+
+    Returns:
+    dict: 'stations' plus, for each of 'shear', 'moment' and 'deflection', a dict with
+    'max', 'min', 'max_combination' and 'min_combination' lists aligned with stations
+    """
+    if not combinations:
+        raise ValueError("At least one load combination is required.")
+
+    case_names = list(cases)
+    for combo_name, combo in combinations.items():
+        unknown = set(combo) - set(case_names)
+        if unknown:
+            raise ValueError(f"Combination '{combo_name}' refers to unknown load cases: {sorted(unknown)}")
+
+    stations = beam_stations(length, num_stations)
+    diagrams = [unit_case_diagrams(length, cases[name], elastic_modulus, moment_of_inertia, stations)
+                for name in case_names]
+
+    combo_names = list(combinations)
+    factors = [[combinations[combo].get(case, 0.0) for case in case_names] for combo in combo_names]
+
+    envelope = {"stations": stations}
+    for quantity in QUANTITIES:
+        combined = combine_cases(factors, [diagram[quantity] for diagram in diagrams])
+        envelope[quantity] = _envelope(combo_names, combined)
+    return envelope
@@ -0,0 +1,362 @@
+import copy
+import hashlib
+import inspect
+import os
+import pickle
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import ex1_I_IshShalom as books
+import ex1_II_IshShalom as mechanics
+import ex1_III_IshShalom as beam_engine
+import instrumentation
+from beam_sections import rectangle
+
+Step = namedtuple("Step", ["name", "func", "inputs", "params", "files", "cache", "copy_inputs"])
+Step.__new__.__defaults__ = ({}, {}, (), True, False)
+Step.__doc__ = """
+One node of a pipeline.
+
+Fields:
+name (str): Unique step name; other steps refer to its output by this name
+func (callable): Called as func(**inputs, **params)
+inputs (dict): Keyword argument -> name of the step whose output is passed
+params (dict): Keyword argument -> literal value
+files (tuple): Names of params holding input file paths; the file contents,
+    not just the paths, become part of the cache key
+cache (bool): Store the output on disk; set False for steps run for their side effects
+copy_inputs (bool): Pass deep copies of the inputs, for functions that mutate their arguments
+"""
+
+EXECUTORS = ("serial", "thread", "process")
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(HERE, ".pipeline_cache")
+# Modules whose source is hashed into every cache key: steps are often thin
+# wrappers whose own source does not change when the engine they call does.
+ENGINE_MODULES = ("ex1_I_IshShalom", "ex1_II_IshShalom", "ex1_III_IshShalom", "beam_sections",
+                  "results_io", "instrumentation", "pipeline")
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, mode='rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _code_digest(func):
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        source = repr(getattr(getattr(func, "__code__", None), "co_code", func))
+    return hashlib.sha256(source.encode()).hexdigest()
+
+
+def _engine_digest():
+    digest = hashlib.sha256()
+    for module in ENGINE_MODULES:
+        digest.update(f"{module}:{_file_digest(os.path.join(HERE, module + '.py'))}|".encode())
+    return digest.hexdigest()
+
+
+def _module_digest(func):
+    try:
+        return _file_digest(inspect.getsourcefile(inspect.unwrap(func)))
+    except (OSError, TypeError):
+        return ""
+
+
+def _call(step, kwargs):
+    if step.copy_inputs:
+        kwargs = copy.deepcopy(kwargs)
+    return step.func(**kwargs, **step.params)
+
+
+class Pipeline:
+    """
+    Directed acyclic graph of steps with on-disk, content-hash keyed caching.
+
+    A step's cache key covers its code and the module defining it, the
+    source of the ENGINE_MODULES, its params, the contents of its input files
+    and the keys of the steps it depends on. Changing one parameter
+    therefore changes the keys of that step and everything downstream of it,
+    and only those steps are recomputed.
+    """
+
+    def __init__(self, steps=(), cache_dir=DEFAULT_CACHE_DIR):
+        self.steps = {}
+        self.cache_dir = cache_dir
+        self.last_run = {"computed": [], "cached": []}
+        for step in steps:
+            self.add(step)
+
+    def add(self, step):
+        """
+        Add a step; its inputs must already be in the pipeline.
+
+        Args:
+        step (Step): Step to add
+
+        Returns:
+        Pipeline: self, for chaining
+        """
+        if step.name in self.steps:
+            raise ValueError(f"Duplicate step name '{step.name}'.")
+        missing = [source for source in step.inputs.values() if source not in self.steps]
+        if missing:
+            raise ValueError(f"Step '{step.name}' depends on unknown steps: {missing}")
+        self.steps[step.name] = step
+        return self
+
+    def with_params(self, name, **params):
+        """
+        Copy of the pipeline with some params of one step replaced.
+
+        Args:
+        name (str): Step to change
+        **params: Replacement param values
+
+        Returns:
+        Pipeline: New pipeline sharing the same cache directory
+        """
+        steps = [step._replace(params={**step.params, **params}) if step.name == name else step
+                 for step in self.steps.values()]
+        return Pipeline(steps, self.cache_dir)
+
+    def cache_keys(self):
+        """
+        Content-hash key of every step, in insertion (topological) order.
+
+        Returns:
+        dict: step name -> hex digest
+        """
+        keys = {}
+        engine = _engine_digest()
+        for step in self.steps.values():
+            digest = hashlib.sha256()
+            func = step.func
+            digest.update(f"{step.name}|{func.__module__}.{func.__qualname__}|{_code_digest(func)}|"
+                          f"{_module_digest(func)}|{engine}".encode())
+            for param in sorted(step.params):
+                value = step.params[param]
+                if param in step.files:
+                    value = _file_digest(value)
+                digest.update(f"|{param}={value!r}".encode())
+            for argument in sorted(step.inputs):
+                digest.update(f"|{argument}<-{keys[step.inputs[argument]]}".encode())
+            keys[step.name] = digest.hexdigest()
+        return keys
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".pkl")
+
+    def _load_cached(self, key):
+        path = self._cache_path(key)
+        try:
+            with open(path, mode='rb') as file:
+                return True, pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return False, None
+
+    def _store(self, key, value):
+        path = self._cache_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, mode='wb') as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    def run(self, executor="thread", max_workers=None, targets=None):
+        """
+        Run the pipeline, executing independent steps concurrently.
+
+        Args:
+        executor (str): 'serial', 'thread' or 'process'; process workers need
+            picklable step functions and inputs
+        max_workers (int): Pool size; the executor's default when omitted
+        targets (list): Step names to produce; all steps when omitted
+
+        Returns:
+        dict: step name -> output for every step that was needed
+        """
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor '{executor}'.")
+
+        needed = self._needed(targets)
+        keys = self.cache_keys()
+        outputs = {}
+        self.last_run = {"computed": [], "cached": []}
+
+        for name in needed:
+            step = self.steps[name]
+            if step.cache:
+                found, value = self._load_cached(keys[name])
+                if found:
+                    outputs[name] = value
+                    self.last_run["cached"].append(name)
+
+        remaining = [name for name in needed if name not in outputs]
+        if executor == "serial":
+            for name in remaining:
+                self._finish(name, _call(self.steps[name], self._arguments(name, outputs)), keys, outputs)
+            return outputs
+
+        if executor == "thread":
+            pool = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            pool = ProcessPoolExecutor(max_workers=max_workers, **instrumentation.worker_options())
+        with pool:
+            running = {}
+            while remaining or running:
+                for name in [n for n in remaining if self._ready(n, outputs)]:
+                    remaining.remove(name)
+                    arguments = (_call, self.steps[name], self._arguments(name, outputs))
+                    if executor == "process":
+                        arguments = (instrumentation.call_measured,) + arguments
+                    running[pool.submit(*arguments)] = name
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    result = instrumentation.collect(future) if executor == "process" else future.result()
+                    self._finish(name, result, keys, outputs)
+        return outputs
+
+    def _needed(self, targets):
+        if targets is None:
+            return list(self.steps)
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.steps:
+                raise ValueError(f"Unknown step '{name}'.")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.steps[name].inputs.values())
+        return [name for name in self.steps if name in needed]
+
+    def _ready(self, name, outputs):
+        return all(source in outputs for source in self.steps[name].inputs.values())
+
+    def _arguments(self, name, outputs):
+        return {argument: outputs[source] for argument, source in self.steps[name].inputs.items()}
+
+    def _finish(self, name, value, keys, outputs):
+        outputs[name] = value
+        self.last_run["computed"].append(name)
+        if self.steps[name].cache:
+            self._store(keys[name], value)
+
+
+def _positions(data):
+    return [(time, position) for time, position, force in data]
+
+
+def _forces(data):
+    return [(time, force) for time, position, force in data]
+
+
+def _collect(**results):
+    return results
+
+
+def _book_results(most_prolific_author, unique_genres, average_price_by_genre, recent_books, books_by_price):
+    return {"most_prolific_author": most_prolific_author,
+            "unique_genres": sorted(unique_genres),
+            "average_price_by_genre": sorted(average_price_by_genre.items()),
+            "recent_books": recent_books,
+            "books_by_price": books_by_price}
+
+
+def book_pipeline(input_file="books.csv", output_file="book_analysis_report.txt",
+                  results_file="book_analysis_results.csv", discount_rate=0.1,
+                  start_year=2000, end_year=2023, cache_dir=DEFAULT_CACHE_DIR, results_format=None,
+                  append=False):
+    """
+    The ex1_I main() chain as a pipeline; genres, filtering, sorting and
+    aggregation all depend only on the discounted books and run in parallel.
+    results_format and append are passed to write_results.
+    """
+    return Pipeline([
+        Step("books", books.load_book_data, params={"filename": input_file}, files=("filename",)),
+        Step("discounted", books.calculate_discount_price, {"books": "books"},
+             {"discount_rate": discount_rate}, copy_inputs=True),
+        Step("unique_genres", books.find_unique_genres, {"books": "discounted"}),
+        Step("recent_books", books.filter_books_by_year, {"books": "discounted"},
+             {"start_year": start_year, "end_year": end_year}),
+        Step("books_by_price", books.sort_books, {"books": "discounted"}, {"sort_by": "price", "reverse": True}),
+        Step("most_prolific_author", books.find_most_prolific_author, {"books": "discounted"}),
+        Step("average_price_by_genre", books.calculate_average_price_by_genre, {"books": "discounted"}),
+        Step("report", books.generate_book_report, {"books": "discounted"},
+             {"output_filename": output_file}, cache=False),
+        Step("results", _book_results, {"most_prolific_author": "most_prolific_author",
+                                   "unique_genres": "unique_genres",
+                                   "average_price_by_genre": "average_price_by_genre",
+                                   "recent_books": "recent_books",
+                                   "books_by_price": "books_by_price"}),
+        Step("write_results", books.write_results, {"results_data": "results"},
+             {"filename": results_file, "fmt": results_format, "append": append}, cache=False),
+    ], cache_dir)
+
+
+def mechanics_pipeline(input_file="mechanical_data.csv", output_file="analysis_results.csv",
+                       time_step=0.1, cache_dir=DEFAULT_CACHE_DIR, results_format=None, append=False):
+    """The ex1_II main() chain as a pipeline; results_format and append are passed to write_results."""
+    return Pipeline([
+        Step("data", mechanics.read_mechanical_data, params={"filename": input_file}, files=("filename",)),
+        Step("position_data", _positions, {"data": "data"}),
+        Step("force_data", _forces, {"data": "data"}),
+        Step("velocity", mechanics.calculate_velocity, {"position_data": "position_data"},
+             {"time_step": time_step}),
+        Step("acceleration", mechanics.calculate_acceleration, {"velocity_data": "velocity"},
+             {"time_step": time_step}),
+        Step("max_force", mechanics.find_max_force, {"force_data": "force_data"}),
+        Step("work_done", mechanics.calculate_work_done, {"force_data": "force_data",
+                                                          "position_data": "position_data"}),
+        Step("results", _collect, {"velocity": "velocity", "acceleration": "acceleration",
+                                   "max_force": "max_force", "work_done": "work_done"}),
+        Step("write_results", mechanics.write_results, {"results_data": "results"},
+             {"filename": output_file, "fmt": results_format, "append": append}, cache=False),
+    ], cache_dir)
+
+
+def _beam_length(beam):
+    return beam[0]
+
+
+def _beam_section(beam):
+    return rectangle(beam[1], beam[2])
+
+
+def _beam_deflection(beam, section):
+    length, width, height, elastic_modulus, loads = beam
+    return beam_engine.calculate_max_deflection(length, loads, elastic_modulus, section)
+
+
+def _beam_loads(beam):
+    return list(beam[4])
+
+
+def beam_pipeline(input_file="beam_data.csv", output_file="beam_analysis_results.csv",
+                  cache_dir=DEFAULT_CACHE_DIR):
+    """The ex1_III main() chain as a pipeline; moment, shear and deflection run in parallel."""
+    return Pipeline([
+        Step("beam", beam_engine.read_beam_data, params={"filename": input_file}, files=("filename",)),
+        Step("length", _beam_length, {"beam": "beam"}),
+        Step("loads", _beam_loads, {"beam": "beam"}),
+        Step("section", _beam_section, {"beam": "beam"}),
+        Step("max_moment", beam_engine.calculate_bending_moment, {"length": "length", "loads": "loads"}),
+        Step("max_shear", beam_engine.calculate_shear_force, {"length": "length", "loads": "loads"},
+             copy_inputs=True),
+        Step("max_bending_stress", beam_engine.calculate_max_bending_stress,
+             {"max_moment": "max_moment", "moment_of_inertia": "section"}),
+        Step("max_shear_stress", beam_engine.calculate_max_shear_stress,
+             {"max_shear": "max_shear", "first_moment": "section"}),
+        Step("max_deflection", _beam_deflection, {"beam": "beam", "section": "section"}),
+        Step("results", _collect, {"max_bending_stress": "max_bending_stress",
+                                   "max_shear_stress": "max_shear_stress",
+                                   "max_deflection": "max_deflection"}),
+        Step("write_results", beam_engine.write_results, {"results_data": "results"},
+             {"filename": output_file}, cache=False),
+    ], cache_dir)
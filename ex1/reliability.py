@@ -0,0 +1,256 @@
+import hashlib
+import math
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import instrumentation
+from beam_sections import compute_section
+from ex1_III_IshShalom import (calculate_bending_moment, calculate_max_bending_stress,
+                               calculate_max_deflection, calculate_max_shear_stress,
+                               calculate_shear_force)
+from instrumentation import instrument
+
+RandomVariable = namedtuple("RandomVariable", ["distribution", "mean", "cov"])
+
+BeamReliabilityModel = namedtuple(
+    "BeamReliabilityModel",
+    ["length", "width", "height", "elastic_modulus", "loads",
+     "bending_stress_limit", "shear_stress_limit", "deflection_limit"],
+)
+BeamReliabilityModel.__new__.__defaults__ = (None, None, None)
+BeamReliabilityModel.__doc__ = """
+Rectangular beam with uncertain properties and the limits it is checked against.
+
+Fields:
+length (float): Length of the beam
+width, height, elastic_modulus (float or RandomVariable): Section and material properties;
+    normal variables are truncated at zero, since only positive values are physical
+loads (list): List of (position, magnitude) tuples, magnitude a float or RandomVariable
+bending_stress_limit, shear_stress_limit, deflection_limit (float): Allowable values;
+    None skips that check
+"""
+
+LIMIT_STATES = ("bending", "shear", "deflection", "any")
+
+
+def normal(mean, cov):
+    """Normally distributed variable with the given mean and coefficient of variation."""
+    return RandomVariable("normal", float(mean), float(cov))
+
+
+def lognormal(mean, cov):
+    """Lognormally distributed variable with the given mean and coefficient of variation."""
+    return RandomVariable("lognormal", float(mean), float(cov))
+
+
+def _truncated_gauss(mu, sigma):
+    def sample(rng):
+        while True:
+            value = rng.gauss(mu, sigma)
+            if value > 0:
+                return value
+    return sample
+
+
+def _sampler(variable, positive=False):
+    """
+    Return a function rng -> sample for a float or RandomVariable.
+
+    With positive=True the quantity must be strictly positive: constants and
+    means are checked up front and normal samples are redrawn until positive,
+    so a long run cannot fail partway on a non-physical realization.
+    """
+    if not isinstance(variable, RandomVariable):
+        value = float(variable)
+        if positive and value <= 0:
+            raise ValueError(f"Expected a positive value, got {value}.")
+        return lambda rng: value
+    if positive and variable.mean <= 0:
+        raise ValueError(f"Expected a positive mean, got {variable.mean}.")
+    if variable.distribution == "normal":
+        mu, sigma = variable.mean, abs(variable.mean) * variable.cov
+        if positive:
+            return _truncated_gauss(mu, sigma)
+        return lambda rng: rng.gauss(mu, sigma)
+    if variable.distribution == "lognormal":
+        if variable.mean <= 0:
+            raise ValueError("A lognormal variable needs a positive mean.")
+        sigma = math.sqrt(math.log1p(variable.cov**2))
+        mu = math.log(variable.mean) - sigma**2 / 2
+        return lambda rng: rng.lognormvariate(mu, sigma)
+    raise ValueError(f"Unknown distribution '{variable.distribution}'.")
+
+
+def chunk_rng(seed, chunk_index):
+    """
+    Independent, reproducible random stream for one chunk of samples.
+
+    The stream depends only on (seed, chunk_index), so results do not change
+    with the number of workers or the order in which chunks finish.
+    """
+    digest = hashlib.sha256(f"{seed}:{chunk_index}".encode()).digest()
+    return random.Random(int.from_bytes(digest, "big"))
+
+
+@instrument(rows=lambda result, args: result[0])
+def _simulate_chunk(args):
+    model, seed, chunk_index, size = args
+    rng = chunk_rng(seed, chunk_index)
+
+    sample_width = _sampler(model.width, positive=True)
+    sample_height = _sampler(model.height, positive=True)
+    sample_modulus = _sampler(model.elastic_modulus, positive=True)
+    load_samplers = [(float(position), _sampler(magnitude)) for position, magnitude in model.loads]
+    length = model.length
+
+    failures = dict.fromkeys(LIMIT_STATES, 0)
+    for _ in range(size):
+        section = compute_section("rectangle", (sample_width(rng), sample_height(rng)))
+        elastic_modulus = sample_modulus(rng)
+        loads = [(position, sample(rng)) for position, sample in load_samplers]
+
+        failed = False
+        if model.bending_stress_limit is not None:
+            stress = calculate_max_bending_stress(calculate_bending_moment(length, loads), section)
+            if abs(stress) > model.bending_stress_limit:
+                failures["bending"] += 1
+                failed = True
+        if model.shear_stress_limit is not None:
+            stress = calculate_max_shear_stress(calculate_shear_force(length, loads), section)
+            if abs(stress) > model.shear_stress_limit:
+                failures["shear"] += 1
+                failed = True
+        if model.deflection_limit is not None:
+            deflection = calculate_max_deflection(length, loads, elastic_modulus, section)
+            if deflection > model.deflection_limit:
+                failures["deflection"] += 1
+                failed = True
+        if failed:
+            failures["any"] += 1
+    return size, failures
+
+
+def wilson_interval(failures, samples, confidence=0.95):
+    """
+    Wilson score confidence interval for a binomial proportion.
+
+    Args:
+    failures (int): Number of exceedances
+    samples (int): Number of realizations
+    confidence (float): Two-sided confidence level
+
+    Returns:
+    tuple: (lower, upper) bounds on the exceedance probability
+    """
+    if samples == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = failures / samples
+    denominator = 1 + z**2 / samples
+    centre = (p + z**2 / (2 * samples)) / denominator
+    spread = z * math.sqrt(p * (1 - p) / samples + z**2 / (4 * samples**2)) / denominator
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+
+def _estimator_cov(failures, samples):
+    if failures == 0:
+        return math.inf
+    p = failures / samples
+    return math.sqrt((1 - p) / (samples * p))
+
+
+def _chunk_tasks(model, seed, num_samples, chunk_size):
+    index = 0
+    remaining = num_samples
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield model, seed, index, size
+        index += 1
+        remaining -= size
+
+
+def _run_chunks(tasks, workers):
+    if not workers or workers == 1:
+        for task in tasks:
+            yield _simulate_chunk(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers, **instrumentation.worker_options()) as executor:
+        pending = []
+        try:
+            for task in tasks:
+                pending.append(executor.submit(instrumentation.call_measured, _simulate_chunk, task))
+                if len(pending) >= 2 * workers:
+                    yield instrumentation.collect(pending.pop(0))
+            for future in pending:
+                yield instrumentation.collect(future)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def failure_probability(model, num_samples=100000, seed=0, chunk_size=10000, workers=None,
+                        confidence=0.95, target_cov=None):
+    """
+    Estimate the probability that the beam exceeds its stress or deflection limits.
+
+    Realizations are drawn in chunks, each from its own seeded stream, and
+    evaluated with the deterministic ex1_III functions. Chunks are consumed in
+    order, so a given seed gives the same answer for any number of workers.
+
+    Args:
+    model (BeamReliabilityModel): Beam, uncertainties and limits
+    num_samples (int): Maximum number of realizations
+    seed (int): Base seed of the random streams
+    chunk_size (int): Realizations per chunk (the unit of work for a worker)
+    workers (int): Number of worker processes; None or 1 runs in this process
+    confidence (float): Confidence level of the reported intervals
+    target_cov (float): Stop early once every checked limit state has an
+        estimator coefficient of variation at or below this value
+
+    Returns:
+    dict: 'samples', 'converged', 'history' (per-chunk running estimates) and,
+    for each limit state, 'failures', 'probability', 'confidence_interval' and 'cov'
+    """
+    if num_samples <= 0 or chunk_size <= 0:
+        raise ValueError("num_samples and chunk_size must be positive.")
+
+    checked = [state for state, limit in (("bending", model.bending_stress_limit),
+                                          ("shear", model.shear_stress_limit),
+                                          ("deflection", model.deflection_limit))
+               if limit is not None]
+    if not checked:
+        raise ValueError("The model must set at least one limit.")
+    checked.append("any")
+    for name in ("width", "height", "elastic_modulus"):
+        try:
+            _sampler(getattr(model, name), positive=True)
+        except ValueError as e:
+            raise ValueError(f"Invalid {name}: {e}") from None
+
+    samples = 0
+    failures = dict.fromkeys(checked, 0)
+    history = []
+    converged = False
+
+    for size, chunk_failures in _run_chunks(_chunk_tasks(model, seed, num_samples, chunk_size), workers):
+        samples += size
+        for state in checked:
+            failures[state] += chunk_failures[state]
+        history.append({"samples": samples,
+                        "probability": {state: failures[state] / samples for state in checked}})
+        if target_cov is not None and all(_estimator_cov(failures[state], samples) <= target_cov
+                                          for state in checked):
+            converged = True
+            break
+
+    results = {"samples": samples, "converged": converged, "history": history}
+    for state in checked:
+        results[state] = {
+            "failures": failures[state],
+            "probability": failures[state] / samples,
+            "confidence_interval": wilson_interval(failures[state], samples, confidence),
+            "cov": _estimator_cov(failures[state], samples),
+        }
+    return results
@@ -0,0 +1,219 @@
+import csv
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+
+Field = namedtuple("Field", ["key", "title", "kind", "columns", "keys"])
+Field.__new__.__defaults__ = ((), None)
+Field.__doc__ = """
+One entry of a results schema.
+
+Fields:
+key (str): Key of the value in the results dictionary
+title (str): Section title written above the value in CSV output
+kind (str): 'scalar' (single value), 'record' (one row tuple),
+    'series' (list of row tuples or of single values) or 'table' (list of dicts)
+columns (tuple): Column headers; a scalar with no columns is written without a header row
+keys (tuple): For 'table' fields, the dictionary key read for each column
+"""
+
+ResultSchema = namedtuple("ResultSchema", ["name", "fields"])
+
+FORMATS = ("csv", "json", "columnar")
+_EXTENSIONS = {".csv": "csv", ".json": "json", ".jsonl": "json", ".col": "columnar", ".bin": "columnar"}
+_MAGIC = b"ME371COL"
+_KINDS = ("scalar", "record", "series", "table")
+
+
+def infer_format(filename):
+    """
+    Pick an output format from the file extension, defaulting to CSV.
+
+    Args:
+    filename (str): Output file name
+
+    Returns:
+    str: One of 'csv', 'json' or 'columnar'
+    """
+    return _EXTENSIONS.get(os.path.splitext(str(filename))[1].lower(), "csv")
+
+
+def _rows(field, value):
+    """Normalize a field value to a list of row sequences."""
+    if field.kind == "scalar":
+        return [(value,)]
+    if field.kind == "record":
+        return [tuple(value)]
+    if field.kind == "series":
+        return [row if isinstance(row, (tuple, list)) else (row,) for row in value]
+    if field.kind == "table":
+        keys = field.keys or field.columns
+        return [tuple(row.get(key, "") for key in keys) for row in value]
+    raise ValueError(f"Unknown field kind '{field.kind}' for '{field.key}'.")
+
+
+def _selected_fields(schema, results_data):
+    unknown = set(results_data) - {field.key for field in schema.fields}
+    if unknown:
+        raise ValueError(f"Results contain keys not declared in schema '{schema.name}': {sorted(unknown)}")
+    return [field for field in schema.fields if field.key in results_data]
+
+
+def _write_csv(file, schema, results_data, separate):
+    writer = csv.writer(file)
+    for field in _selected_fields(schema, results_data):
+        if separate:
+            writer.writerow([])
+        separate = True
+        writer.writerow([field.title])
+        if field.columns:
+            writer.writerow(field.columns)
+        writer.writerows(_rows(field, results_data[field.key]))
+
+
+def _json_value(field, value):
+    if field.kind == "scalar":
+        return value
+    rows = _rows(field, value)
+    if field.kind == "record":
+        return dict(zip(field.columns, rows[0]))
+    return {"columns": list(field.columns), "data": [list(row) for row in rows]}
+
+
+def _write_json(file, schema, results_data):
+    document = {"schema": schema.name,
+                "results": {field.key: _json_value(field, results_data[field.key])
+                            for field in _selected_fields(schema, results_data)}}
+    file.write(json.dumps(document, default=str) + "\n")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _encode_column(values):
+    if all(_is_number(value) for value in values):
+        column = array("d", values)
+        if sys.byteorder != "little":
+            column.byteswap()
+        return "f8", column.tobytes()
+    return "str", json.dumps([None if value is None else str(value) for value in values]).encode()
+
+
+def _decode_column(kind, payload):
+    if kind == "f8":
+        column = array("d")
+        column.frombytes(payload)
+        if sys.byteorder != "little":
+            column.byteswap()
+        return column.tolist()
+    return json.loads(payload.decode())
+
+
+def _write_columnar(file, schema, results_data):
+    header_fields = []
+    payloads = []
+    for field in _selected_fields(schema, results_data):
+        rows = _rows(field, results_data[field.key])
+        width = len(field.columns) or (len(rows[0]) if rows else 1)
+        for row in rows:
+            if len(row) != width:
+                raise ValueError(f"Field '{field.key}' has a row of {len(row)} values where {width} "
+                                 f"columns are expected.")
+        columns = list(zip(*rows)) if rows else [()] * width
+        if field.columns:
+            names = list(field.columns)
+        else:
+            names = [field.key] if width == 1 else [f"{field.key}_{i}" for i in range(width)]
+        described = []
+        for name, values in zip(names, columns):
+            kind, payload = _encode_column(list(values))
+            described.append({"name": name, "type": kind, "nbytes": len(payload)})
+            payloads.append(payload)
+        header_fields.append({"key": field.key, "kind": field.kind, "rows": len(rows), "columns": described})
+
+    header = json.dumps({"schema": schema.name, "fields": header_fields}).encode()
+    file.write(_MAGIC + struct.pack("<I", len(header)) + header)
+    for payload in payloads:
+        file.write(payload)
+
+
+def write_results(filename, results_data, schema, fmt=None, append=False):
+    """
+    Serialize a results dictionary according to its schema.
+
+    Each format supports appending, so batch runs can add one block per run
+    to an existing results store instead of rewriting it: CSV sections are
+    appended after a blank row, JSON documents one per line and columnar
+    blocks back to back. JSON appends need a .jsonl file, since a .json
+    file must stay a single document.
+
+    Args:
+    filename (str or file): Output file name, or an open file (binary for
+        'columnar', text otherwise) that is written to and left open
+    results_data (dict): Results keyed by schema field key; absent fields are skipped
+    schema (ResultSchema): Declares the title, kind and columns of each field
+    fmt (str): 'csv', 'json' or 'columnar'; inferred from the extension when omitted
+    append (bool): Add to the end of an existing file instead of replacing it
+    """
+    is_file = hasattr(filename, "write")
+    fmt = fmt or ("csv" if is_file else infer_format(filename))
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown results format '{fmt}'.")
+    if append and fmt == "json" and not is_file and str(filename).lower().endswith(".json"):
+        raise ValueError(f"Cannot append to {filename}: a .json file holds one document; "
+                         f"use a .jsonl file to collect one document per run.")
+    for field in schema.fields:
+        if field.kind not in _KINDS:
+            raise ValueError(f"Unknown field kind '{field.kind}' for '{field.key}'.")
+
+    if is_file:
+        if fmt == "columnar":
+            _write_columnar(filename, schema, results_data)
+        elif fmt == "csv":
+            _write_csv(filename, schema, results_data, False)
+        else:
+            _write_json(filename, schema, results_data)
+        return
+
+    if fmt == "columnar":
+        with open(filename, mode='ab' if append else 'wb') as file:
+            _write_columnar(file, schema, results_data)
+        return
+
+    has_content = append and os.path.exists(filename) and os.path.getsize(filename) > 0
+    with open(filename, mode='a' if append else 'w', newline='') as file:
+        if fmt == "csv":
+            _write_csv(file, schema, results_data, has_content)
+        else:
+            _write_json(file, schema, results_data)
+
+
+def read_columnar(filename):
+    """
+    Read back every block of a columnar results file.
+
+    Args:
+    filename (str): Name of the columnar file
+
+    Yields:
+    tuple: (schema name, dict of field key -> list of row tuples)
+    """
+    with open(filename, mode='rb') as file:
+        while True:
+            magic = file.read(len(_MAGIC))
+            if not magic:
+                return
+            if magic != _MAGIC:
+                raise ValueError(f"{filename} is not a columnar results file.")
+            (length,) = struct.unpack("<I", file.read(4))
+            header = json.loads(file.read(length).decode())
+            block = {}
+            for field in header["fields"]:
+                columns = [_decode_column(column["type"], file.read(column["nbytes"]))
+                           for column in field["columns"]]
+                block[field["key"]] = list(zip(*columns))
+            yield header["schema"], block
@@ -0,0 +1,91 @@
+import csv
+import math
+import random
+
+AUTHORS = ["Stephen King", "Jane Austen", "F. Scott Fitzgerald", "Virginia Woolf", "George Orwell",
+           "J.K. Rowling", "Ernest Hemingway", "Agatha Christie", "Mark Twain", "Toni Morrison"]
+GENRES = ["Romance", "Non-Fiction", "Historical Fiction", "Fiction", "Mystery",
+          "Science Fiction", "Fantasy", "Thriller"]
+
+_BATCH = 10000
+
+
+def _write_batched(writer, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == _BATCH:
+            writer.writerows(batch)
+            batch = []
+    writer.writerows(batch)
+
+
+def generate_books(filename, rows, seed=0):
+    """
+    Write a books.csv-style file with random books.
+
+    Args:
+    filename (str): Name of the output CSV file
+    rows (int): Number of books
+    seed (int): Seed of the random generator
+    """
+    rng = random.Random(seed)
+
+    def books():
+        for i in range(1, rows + 1):
+            yield (f"Book {i}", rng.choice(AUTHORS), rng.randint(1900, 2023),
+                   rng.choice(GENRES), round(rng.uniform(5, 30), 2))
+
+    with open(filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["title", "author", "year", "genre", "price"])
+        _write_batched(writer, books())
+
+
+def generate_mechanical_data(filename, rows, seed=0, time_step=0.1):
+    """
+    Write a mechanical_data.csv-style file: a noisy oscillation sampled at a fixed time step.
+
+    Args:
+    filename (str): Name of the output CSV file
+    rows (int): Number of samples
+    seed (int): Seed of the random generator
+    time_step (float): Time between samples
+    """
+    rng = random.Random(seed)
+
+    def samples():
+        for i in range(rows):
+            t = round(i * time_step, 6)
+            position = round(t + 0.5 * math.sin(t) + rng.gauss(0, 0.05), 4)
+            force = round(10 * math.cos(t) + rng.gauss(0, 0.5), 4)
+            yield t, position, force
+
+    with open(filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["time", "position", "force"])
+        _write_batched(writer, samples())
+
+
+def generate_beam_data(filename, loads, seed=0):
+    """
+    Write a beam_data.csv-style file: one beam followed by random point loads.
+
+    Args:
+    filename (str): Name of the output CSV file
+    loads (int): Number of point loads
+    seed (int): Seed of the random generator
+    """
+    rng = random.Random(seed)
+    length = round(rng.uniform(1, 5), 2)
+
+    def point_loads():
+        for _ in range(loads):
+            yield round(rng.uniform(0, length), 2), round(rng.uniform(500, 5000), 1)
+
+    with open(filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["length", "width", "height", "elastic_modulus"])
+        writer.writerow([length, round(rng.uniform(0.05, 0.3), 3), round(rng.uniform(0.05, 0.3), 3),
+                         round(rng.uniform(0.7e11, 2.1e11))])
+        _write_batched(writer, point_loads())
@@ -1,5 +1,6 @@
 import csv
 import json
+import os
 
 def load_book_data(filename):
     """
@@ -46,8 +47,9 @@ def find_unique_genres(books):
     return genres
     
 def main():
-    input_file = '/Users/adiv/git/ME371/ex1/books.csv'
-    output_file = '/Users/adiv/git/ME371/ex1/book_analysis_report.txt'
+    here = os.path.dirname(os.path.abspath(__file__))
+    input_file = os.path.join(here, 'books.csv')
+    output_file = os.path.join(here, 'book_analysis_report.txt')
     
     try:
         # Load data
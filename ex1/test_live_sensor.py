@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from live_sensor import LiveKinematicsService, _serve
+
+
+def test_duplicate_timestamp_is_skipped_and_stop_returns():
+    lines = ["0.0,0.0,1.0\n", "0.1,0.5,2.0\n", "0.1,0.7,3.0\n", "0.2,1.0,4.0\n"]
+    lines += [f"{0.3 + i / 10},{i},1.0\n" for i in range(20)]
+
+    async def run():
+        service = LiveKinematicsService(queue_size=2)
+        updates = service.subscribe(maxsize=100)
+        processor = asyncio.create_task(service.process())
+        for line in lines:
+            await service.feed_line(line)
+        await asyncio.wait_for(service.stop(), timeout=5)
+        await asyncio.wait_for(processor, timeout=5)
+        received = []
+        while (update := updates.get_nowait()) is not None:
+            received.append(update)
+        return service, received
+
+    service, received = asyncio.run(run())
+    assert service.invalid_samples == 1
+    assert service.stats()["samples"] == len(lines) - 1
+    assert [update["time"] for update in received[:3]] == [0.0, 0.1, 0.2]
+    assert abs(received[2]["velocity"] - 5.0) < 1e-9
+
+
+def test_stop_returns_after_processor_died():
+    async def run():
+        service = LiveKinematicsService(queue_size=2)
+        processor = asyncio.create_task(service.process())
+        await asyncio.sleep(0)
+        processor.cancel()
+        await asyncio.gather(processor, return_exceptions=True)
+        for i in range(10):
+            await asyncio.wait_for(service.feed_line(f"{i},0.0,0.0\n"), timeout=5)
+        await asyncio.wait_for(service.stop(), timeout=5)
+
+    asyncio.run(run())
+
+
+def test_processor_skips_unsubscribed_consumer():
+    async def run():
+        service = LiveKinematicsService(queue_size=2)
+        service.subscribe(maxsize=2)  # never read, as if its consumer had failed
+        processor = asyncio.create_task(service.process())
+        for i in range(3):
+            await service.feed_line(f"{i},0.0,0.0\n")
+        await asyncio.sleep(0)
+        service.unsubscribe(service.subscribers[0][0])
+        for i in range(3, 10):
+            await asyncio.wait_for(service.feed_line(f"{i},0.0,0.0\n"), timeout=5)
+        await asyncio.wait_for(service.stop(), timeout=5)
+        await asyncio.wait_for(processor, timeout=5)
+        return service
+
+    assert asyncio.run(run()).stats()["samples"] == 10
+
+
+def test_serve_exits_when_writer_fails(tmp_path):
+    data = tmp_path / "samples.csv"
+    data.write_text("".join(f"{i / 10},{i},1.0\n" for i in range(50)))
+    args = argparse.Namespace(time_step=None, queue_size=2, subscriber_queue=2, tail=str(data), once=False,
+                              output=str(tmp_path / "missing" / "results.csv"))
+
+    assert asyncio.run(asyncio.wait_for(_serve(args), timeout=5)) == 1